@@ -0,0 +1,26 @@
+"""index shopping_lists.last_refreshed for the refresh scheduler
+
+Also merges the seed-data and shopping-list branches, which both revised the initial schema.
+
+Revision ID: d4e5f6g7h8
+Revises: b2c3d4e5f6g7, c3d4e5f6g7
+Create Date: 2026-10-15 12:00:00.000000
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "d4e5f6g7h8"
+down_revision = ("b2c3d4e5f6g7", "c3d4e5f6g7")
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_shopping_lists_last_refreshed", "shopping_lists", ["last_refreshed"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_shopping_lists_last_refreshed", table_name="shopping_lists")
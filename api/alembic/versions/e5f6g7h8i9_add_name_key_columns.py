@@ -0,0 +1,32 @@
+"""add indexed name_key to products and supermarkets
+
+Case-insensitive name lookups (scraper upserts) compare against this lower-cased copy of
+`name` instead of running ILIKE over the name column.
+
+Revision ID: e5f6g7h8i9
+Revises: d4e5f6g7h8
+Create Date: 2026-10-15 12:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "e5f6g7h8i9"
+down_revision = "d4e5f6g7h8"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    for table in ("products", "supermarkets"):
+        op.add_column(table, sa.Column("name_key", sa.String(), nullable=True))
+        # Backfill with the same key the models compute: name.strip().lower()
+        op.execute(f"UPDATE {table} SET name_key = lower(trim(name))")
+        op.create_index(f"ix_{table}_name_key", table, ["name_key"], unique=False)
+
+
+def downgrade() -> None:
+    for table in ("products", "supermarkets"):
+        op.drop_index(f"ix_{table}_name_key", table_name=table)
+        op.drop_column(table, "name_key")
@@ -0,0 +1,41 @@
+"""store shopping_lists.last_refreshed as a timezone-aware timestamp
+
+The refresh flow and scheduler write and compare UTC-aware datetimes; on a naive
+`timestamp` column PostgreSQL converts them with the session TimeZone, which shifts the
+stamps by the UTC offset when that zone is not UTC. Existing values were written as UTC.
+
+Revision ID: f6g7h8i9j0
+Revises: e5f6g7h8i9
+Create Date: 2026-10-15 12:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "f6g7h8i9j0"
+down_revision = "e5f6g7h8i9"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.alter_column(
+        "shopping_lists",
+        "last_refreshed",
+        type_=sa.DateTime(timezone=True),
+        existing_type=sa.DateTime(),
+        existing_nullable=True,
+        postgresql_using="last_refreshed AT TIME ZONE 'UTC'",
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        "shopping_lists",
+        "last_refreshed",
+        type_=sa.DateTime(),
+        existing_type=sa.DateTime(timezone=True),
+        existing_nullable=True,
+        postgresql_using="last_refreshed AT TIME ZONE 'UTC'",
+    )
@@ -2,10 +2,27 @@
 Database connection and session management
 """
 
+from decimal import Decimal
 from sqlalchemy import create_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 from app.config import settings
 
+try:
+    import orjson
+except Exception:
+    orjson = None
+
+
+def _orjson_default(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _orjson_dumps(value) -> str:
+    return orjson.dumps(value, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
 # Create engine with connection pooling (pool_size=5)
 # SQL_CONNECTION_STRING is read from environment variable
 # SQLite doesn't support pool_size and max_overflow, so conditionally apply them
@@ -14,6 +31,12 @@ engine_kwargs = {
     "echo": settings.debug,
 }
 
+# JSON columns (e.g. shopping-list comparison_json) are encoded with orjson when it is
+# installed; it is several times faster than the stdlib json module SQLAlchemy uses otherwise
+if orjson is not None:
+    engine_kwargs["json_serializer"] = _orjson_dumps
+    engine_kwargs["json_deserializer"] = orjson.loads
+
 # Only use connection pooling and timeout for non-SQLite databases
 if not settings.sql_connection_string.startswith("sqlite"):
     engine_kwargs["pool_size"] = 5
@@ -24,7 +47,9 @@ if not settings.sql_connection_string.startswith("sqlite"):
 engine = create_engine(settings.sql_connection_string, **engine_kwargs)
 
 # Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# expire_on_commit=False keeps committed objects usable without a re-SELECT;
+# sessions are short-lived (per request / per background task) so staleness isn't a concern
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 # Base class for models
 Base = declarative_base()
@@ -177,6 +177,13 @@ async def _stop_scheduler():
     except Exception as e:
         logger.warning(f"Error stopping scheduler: {e}")
 
+    try:
+        from app.services import refresh_service
+
+        refresh_service.shutdown_scoring_pool()
+    except Exception as e:
+        logger.warning(f"Error stopping scoring pool: {e}")
+
 
 @app.get("/")
 async def root():
@@ -4,11 +4,16 @@ Aligned to Team A's schema
 """
 
 from sqlalchemy import Column, Integer, String, ForeignKey, Index, Numeric
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import backref, relationship, validates
 from app.db import Base
 from sqlalchemy import DateTime, JSON
 
 
+def name_key(name):
+    """Case-insensitive lookup key for product and supermarket names."""
+    return name.strip().lower() if name is not None else None
+
+
 class Product(Base):
     """Product model - Team A schema: Product(id, name, category)"""
 
@@ -17,6 +22,13 @@ class Product(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False, index=True)
     category = Column(String, nullable=True, index=True)
+    # Indexed lower-cased name: case-insensitive lookups probe this instead of ILIKE on name
+    name_key = Column(String, nullable=True, index=True)
+
+    @validates("name")
+    def _sync_name_key(self, key, value):
+        self.name_key = name_key(value)
+        return value
 
 
 class Supermarket(Base):
@@ -27,6 +39,13 @@ class Supermarket(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False, index=True)
     city = Column(String, nullable=True, index=True)
+    # Indexed lower-cased name, kept in sync with `name` (see Product.name_key)
+    name_key = Column(String, nullable=True, index=True)
+
+    @validates("name")
+    def _sync_name_key(self, key, value):
+        self.name_key = name_key(value)
+        return value
 
 
 class Price(Base):
@@ -60,7 +79,8 @@ class ShoppingList(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
     owner = Column(String, nullable=True)
-    last_refreshed = Column(DateTime, nullable=True)
+    # Indexed: the scheduler selects lists by last_refreshed every tick
+    last_refreshed = Column(DateTime(timezone=True), nullable=True, index=True)
 
 
 class ShoppingListItem(Base):
@@ -77,11 +97,13 @@ class ShoppingListItem(Base):
 
     # Selected best offer
     best_store = Column(String, nullable=True)
-    best_price = Column(Numeric(10, 2), nullable=True)
+    # asdecimal=False: the DB column stays DECIMAL but loads as a Python float,
+    # so response rendering doesn't re-cast Decimal -> float per item
+    best_price = Column(Numeric(10, 2, asdecimal=False), nullable=True)
     best_url = Column(String, nullable=True)
 
     # Full comparison breakdown for debugging / frontend
     comparison_json = Column(JSON, nullable=True)
 
-    # Relationship
-    shopping_list = relationship("ShoppingList", backref="items")
+    # Relationship - items are loaded with one follow-up IN query instead of a lazy load per list
+    shopping_list = relationship("ShoppingList", backref=backref("items", lazy="selectin"))
@@ -8,6 +8,7 @@ from typing import List, Optional
 from app.db import get_db
 from app.models import Product
 from app.schemas import Product as ProductSchema, ProductCreate, ProductUpdate, ProductResponse
+from app.services.compare_service import invalidate_catalog_cache
 
 router = APIRouter()
 
@@ -92,6 +93,7 @@ async def update_product(product_id: int, product: ProductUpdate, db: Session =
         setattr(db_product, field, value)
 
     db.commit()
+    invalidate_catalog_cache()
     db.refresh(db_product)
     return db_product
 
@@ -107,4 +109,5 @@ async def delete_product(product_id: int, db: Session = Depends(get_db)):
 
     db.delete(db_product)
     db.commit()
+    invalidate_catalog_cache()
     return None
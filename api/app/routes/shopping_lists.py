@@ -104,7 +104,7 @@ def _item_to_response(item: ShoppingListItem) -> ShoppingListItemResponse:
         category=item.category,
         variants=item.variants,
         best_store=item.best_store,
-        best_price=float(item.best_price) if item.best_price else None,
+        best_price=item.best_price,
         best_url=item.best_url,
         comparison_json=item.comparison_json,
     )
@@ -134,10 +134,12 @@ def create_shopping_list(data: ShoppingListCreate, db: Session = Depends(get_db)
     sl = ShoppingList(name=data.name, owner=data.owner)
     db.add(sl)
     db.commit()
-    db.refresh(sl)
 
     logger.info("Created shopping list id=%s name=%s", sl.id, sl.name)
-    return _list_to_response(sl)
+    # A new list has no items yet - no need to load the relationship
+    return ShoppingListResponse(
+        id=sl.id, name=sl.name, owner=sl.owner, last_refreshed=sl.last_refreshed, items=[]
+    )
 
 
 @router.get("/", response_model=List[ShoppingListSummary])
@@ -216,7 +218,6 @@ def add_item_to_list(list_id: int, data: ShoppingListItemCreate, db: Session = D
     )
     db.add(item)
     db.commit()
-    db.refresh(item)
 
     logger.info("Added item id=%s to list id=%s", item.id, list_id)
     return _item_to_response(item)
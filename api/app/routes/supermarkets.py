@@ -13,6 +13,7 @@ from app.schemas import (
     SupermarketUpdate,
     SupermarketResponse,
 )
+from app.services.compare_service import invalidate_catalog_cache
 
 router = APIRouter()
 
@@ -75,6 +76,7 @@ async def update_supermarket(
         setattr(db_supermarket, field, value)
 
     db.commit()
+    invalidate_catalog_cache()
     db.refresh(db_supermarket)
     return db_supermarket
 
@@ -91,4 +93,5 @@ async def delete_supermarket(supermarket_id: int, db: Session = Depends(get_db))
 
     db.delete(db_supermarket)
     db.commit()
+    invalidate_catalog_cache()
     return None
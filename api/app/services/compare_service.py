@@ -2,8 +2,12 @@
 Product comparison service
 """
 
-from typing import List, Optional, Dict, Tuple
-from decimal import Decimal
+import os
+import sys
+import time
+from typing import Any, Callable, List, Optional, Dict, Tuple
+from decimal import Decimal, ROUND_HALF_UP
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 from app.schemas import (
     ProductComparison,
@@ -15,13 +19,66 @@ from app.schemas import (
     ItemPriceComparison,
 )
 from app.services.normalization import (
-    normalize_product_name,
     normalize_item_name,
-    calculate_similarity,
+    product_token_set,
+    token_similarity,
 )
 from app.models import Product, Supermarket, Price
 
 
+def _to_cents(value) -> int:
+    """Convert a 2-decimal DB price to integer cents."""
+    return int((Decimal(value) * 100).to_integral_value(rounding=ROUND_HALF_UP))
+
+
+# Name -> id lookup tables for compare_basket, reused across requests instead of scanning
+# and re-normalizing the catalog every time. Each entry is tagged with (database URL, row
+# count, max id), so inserts and deletes - including those made by the scrapers - trigger a
+# rebuild; renames go through the routes, which call invalidate_catalog_cache(), and the TTL
+# bounds anything else.
+CATALOG_CACHE_TTL_SECONDS = float(os.getenv("CATALOG_CACHE_TTL_SECONDS", "300"))
+_catalog_cache: Dict[str, Tuple[tuple, float, Any]] = {}
+
+
+def invalidate_catalog_cache() -> None:
+    """Drop the cached product/store name indexes (call after renaming catalog rows)."""
+    _catalog_cache.clear()
+
+
+def _cached_index(db: Session, model, build: Callable[[Session], Any]):
+    count, max_id = db.execute(select(func.count(model.id), func.max(model.id))).one()
+    version = (str(db.get_bind().url), count, max_id)
+    now = time.monotonic()
+    cached = _catalog_cache.get(model.__tablename__)
+    if cached and cached[0] == version and now - cached[1] < CATALOG_CACHE_TTL_SECONDS:
+        return cached[2]
+    index = build(db)
+    _catalog_cache[model.__tablename__] = (version, now, index)
+    return index
+
+
+def _build_product_index(db: Session) -> Dict[str, int]:
+    """Normalized product name -> product id (first product wins on duplicates)."""
+    index: Dict[str, int] = {}
+    for product_id, name in db.execute(select(Product.id, Product.name).order_by(Product.id)):
+        normalized_product_name = normalize_item_name(name)
+        if normalized_product_name and normalized_product_name not in index:
+            index[normalized_product_name] = product_id
+    return index
+
+
+def _build_store_index(db: Session) -> Dict[str, Tuple[int, str]]:
+    """Lower-cased store name -> (store id, display name)."""
+    index: Dict[str, Tuple[int, str]] = {}
+    for store_id, name in db.execute(
+        select(Supermarket.id, Supermarket.name).order_by(Supermarket.id)
+    ):
+        normalized_store_name = name.lower().strip()
+        if normalized_store_name not in index:
+            index[normalized_store_name] = (store_id, name)
+    return index
+
+
 class CompareService:
     """Service for comparing products and prices"""
 
@@ -37,12 +94,13 @@ class CompareService:
         if threshold is None:
             threshold = self.min_similarity_threshold
 
-        normalized_query = normalize_product_name(query)
+        # Tokenize the query once rather than once per candidate product
+        query_tokens = product_token_set(query)
         matches = []
 
         for product in products:
-            product_name = product.get("name", "")
-            similarity = calculate_similarity(normalized_query, product_name)
+            product_tokens = product_token_set(product.get("name", ""))
+            similarity = token_similarity(query_tokens, product_tokens)
 
             if similarity >= threshold:
                 matches.append({**product, "similarity": similarity})
@@ -83,7 +141,9 @@ class CompareService:
         if not comparisons:
             return {"count": 0, "min": 0.0, "max": 0.0, "average": 0.0, "median": 0.0}
 
-        prices = sorted([c.price for c in comparisons])
+        # One list, sorted in place: min/max/median are then read off by position
+        prices = [c.price for c in comparisons]
+        prices.sort()
         count = len(prices)
 
         return {
@@ -115,41 +175,26 @@ class CompareService:
         normalized_items = [normalize_item_name(item) for item in request.items]
 
         # Step 2: Resolve product IDs by exact name match on normalized names
-        all_products = db.query(Product).all()
-
-        # Build a mapping of normalized product name to product
-        normalized_product_name_to_product: Dict[str, Product] = {}
-        for product in all_products:
-            normalized_product_name = normalize_item_name(product.name)
-            if (
-                normalized_product_name
-                and normalized_product_name not in normalized_product_name_to_product
-            ):
-                normalized_product_name_to_product[normalized_product_name] = product
-
-        # Map requested items to products using exact normalized name match
-        item_to_product: Dict[str, Optional[Product]] = {}
+        normalized_product_name_to_id = _cached_index(db, Product, _build_product_index)
+
+        # Map requested items to product ids using exact normalized name match
+        item_to_product: Dict[str, Optional[int]] = {}
         unmatched: List[str] = []
 
         for i, item in enumerate(request.items):
             normalized_item = normalized_items[i]
 
-            if normalized_item in normalized_product_name_to_product:
-                item_to_product[item] = normalized_product_name_to_product[normalized_item]
+            if normalized_item in normalized_product_name_to_id:
+                item_to_product[item] = normalized_product_name_to_id[normalized_item]
             else:
                 item_to_product[item] = None
                 unmatched.append(item)
 
         # Step 3: Resolve store IDs
-        all_stores = db.query(Supermarket).all()
-        store_name_to_store: Dict[str, Supermarket] = {}
-        for store in all_stores:
-            normalized_store_name = store.name.lower().strip()
-            if normalized_store_name not in store_name_to_store:
-                store_name_to_store[normalized_store_name] = store
-
-        # Get store objects for requested stores
-        store_objs: List[Supermarket] = []
+        store_name_to_store = _cached_index(db, Supermarket, _build_store_index)
+
+        # Get (id, name) for requested stores
+        store_objs: List[Tuple[int, str]] = []
         for store_name in request.stores:
             normalized_store_name = store_name.lower().strip()
             if normalized_store_name in store_name_to_store:
@@ -162,59 +207,58 @@ class CompareService:
             )
 
         # Get product IDs and store IDs for the query
-        product_ids = [p.id for item, p in item_to_product.items() if p is not None]
-        store_ids = [s.id for s in store_objs]
+        product_ids = [pid for pid in item_to_product.values() if pid is not None]
+        store_ids = [sid for sid, _ in store_objs]
 
         # Step 4: Query all prices for product_id IN (...) and store_id IN (...) in one query
-        prices_map: Dict[Tuple[int, int], Decimal] = {}
+        # Prices are laid out as one row per product: product_id -> {store_id: price}, so each
+        # item reads its candidates straight from its own row instead of probing every store.
+        # Values are integer cents; Decimal is only used at the DB boundary.
+        price_rows: Dict[int, Dict[int, int]] = {}
 
         if product_ids and store_ids:
-            prices = (
-                db.query(Price)
-                .filter(Price.product_id.in_(product_ids), Price.store_id.in_(store_ids))
-                .all()
+            # Stream plain (product_id, store_id, price) rows; no Price ORM instances are built
+            stmt = select(Price.product_id, Price.store_id, Price.price).where(
+                Price.product_id.in_(product_ids), Price.store_id.in_(store_ids)
             )
 
-            # Build prices_map: (product_id, store_id) -> price (as Decimal)
-            for price in prices:
-                key = (price.product_id, price.store_id)
-                price_value = price.price
-                if key not in prices_map:
-                    prices_map[key] = price_value
-                else:
-                    # Take minimum price if multiple prices exist
-                    prices_map[key] = min(prices_map[key], price_value)
+            for product_id, store_id, price in db.execute(stmt).yield_per(1000):
+                row = price_rows.setdefault(product_id, {})
+                price_value = _to_cents(price)
+                current = row.get(store_id)
+                # Take minimum price if multiple prices exist
+                if current is None or price_value < current:
+                    row[store_id] = price_value
 
         # Step 5: For each requested item: pick min price with tie-breaker
         compare_items: List[CompareItem] = []
-        store_totals: Dict[int, Decimal] = {store_id: Decimal("0.00") for store_id in store_ids}
-        store_id_to_name: Dict[int, str] = {s.id: s.name for s in store_objs}
+        store_totals: Dict[int, int] = {store_id: 0 for store_id in store_ids}
+        # Totals if the whole basket were bought at each store, accumulated in the same pass
+        store_complete_totals: Dict[int, int] = {store_id: 0 for store_id in store_ids}
+        store_id_to_name: Dict[int, str] = dict(store_objs)
 
         # Process items in order
         for item in request.items:
-            product = item_to_product.get(item)
-            if product is None:
+            product_id = item_to_product.get(item)
+            if product_id is None:
                 continue
 
-            # Find all candidate stores with a price for this product
-            candidates: List[Tuple[int, Decimal]] = []
-            for store_id in store_ids:
-                key = (product.id, store_id)
-                if key in prices_map:
-                    price = prices_map[key]
-                    candidates.append((store_id, price))
-
+            # All candidate stores with a price for this product
+            candidates = price_rows.get(product_id)
             if not candidates:
                 if item not in unmatched:
                     unmatched.append(item)
                 continue
 
+            for store_id, price in candidates.items():
+                store_complete_totals[store_id] += price
+
             # Pick the store with minimum price
-            min_price = min(candidates, key=lambda x: x[1])[1]
+            min_price = min(candidates.values())
 
             # Find all stores with the minimum price (ties)
             min_price_stores = [
-                (store_id, price) for store_id, price in candidates if price == min_price
+                (store_id, price) for store_id, price in candidates.items() if price == min_price
             ]
 
             # If there's a tie, use tie-breaker (lower current basket subtotal)
@@ -227,7 +271,7 @@ class CompareService:
 
             # Add to compare_items
             compare_items.append(
-                CompareItem(name=item, store=selected_store_name, price=float(selected_price))
+                CompareItem(name=item, store=selected_store_name, price=selected_price / 100)
             )
 
             # Update running store_totals (used for tie-breaking in next iterations)
@@ -235,28 +279,15 @@ class CompareService:
 
         # Step 6: Build response arrays
         store_totals_list = [
-            StoreTotal(store=store_id_to_name[store_id], total=float(total))
+            StoreTotal(store=store_id_to_name[store_id], total=total / 100)
             for store_id, total in store_totals.items()
         ]
 
-        # Calculate overallTotal (minimum total if you bought all items at one store)
-        store_complete_totals: Dict[int, Decimal] = {}
-        for store_id in store_ids:
-            store_total = Decimal("0.00")
-            for item in request.items:
-                product = item_to_product.get(item)
-                if product is None:
-                    continue
-                key = (product.id, store_id)
-                if key in prices_map:
-                    store_total += prices_map[key]
-            store_complete_totals[store_id] = store_total
-
-        # overallTotal is the minimum total across all stores
+        # overallTotal is the minimum total if you bought all items at one store
         if store_complete_totals.values():
             stores_with_all_items = [total for total in store_complete_totals.values() if total > 0]
             if stores_with_all_items:
-                overall_total = float(min(stores_with_all_items))
+                overall_total = min(stores_with_all_items) / 100
             else:
                 overall_total = 0.0
         else:
@@ -265,8 +296,8 @@ class CompareService:
         # Step 7: Build price comparison data (all prices per item)
         price_comparison: List[ItemPriceComparison] = []
         for item in request.items:
-            product = item_to_product.get(item)
-            if product is None:
+            product_id = item_to_product.get(item)
+            if product_id is None:
                 continue
 
             # Collect all prices for this item
@@ -274,10 +305,10 @@ class CompareService:
             cheapest_price = None
             cheapest_store = None
 
+            row = price_rows.get(product_id, {})
             for store_id in store_ids:
-                key = (product.id, store_id)
-                if key in prices_map:
-                    price = float(prices_map[key])
+                if store_id in row:
+                    price = row[store_id] / 100
                     store_name = store_id_to_name[store_id]
                     item_prices.append(StorePrice(store=store_name, price=price))
 
@@ -317,26 +348,41 @@ class CompareService:
         Returns:
             CompareResponse with items, store totals, overall total, and unmatched items
         """
-        compare_items: List[CompareItem] = []
-        unmatched: List[str] = []
         store_totals: Dict[str, float] = {store: 0.0 for store in stores}
 
-        # Process each item
-        for item in items:
-            item_found = False
-
-            # Check if item exists at any store
-            for store in stores:
-                key = (item, store)
-                if key in item_prices:
-                    price = item_prices[key]
-                    compare_items.append(CompareItem(name=item, store=store, price=price))
-                    store_totals[store] += price
-                    item_found = True
-
-            # Track unmatched items
-            if not item_found:
-                unmatched.append(item)
+        # Positions of each requested item/store, so item_prices (usually sparse) is walked
+        # once instead of probing every (item, store) pair
+        # Names are interned so repeated names share one object and key comparisons against
+        # interned item_prices keys short-circuit on identity
+        items = [sys.intern(item) for item in items]
+        stores = [sys.intern(store) for store in stores]
+        item_idx: Dict[str, List[int]] = {}
+        for i, item in enumerate(items):
+            item_idx.setdefault(item, []).append(i)
+        store_idx: Dict[str, List[int]] = {}
+        for j, store in enumerate(stores):
+            store_idx.setdefault(store, []).append(j)
+
+        hits: List[Tuple[int, int, str, str, float]] = []
+        for (item, store), price in item_prices.items():
+            if item not in item_idx or store not in store_idx:
+                continue
+            for i in item_idx[item]:
+                for j in store_idx[store]:
+                    hits.append((i, j, item, store, price))
+
+        # Keep the item-major, store-minor order of the request
+        hits.sort(key=lambda h: (h[0], h[1]))
+
+        compare_items: List[CompareItem] = []
+        found_items = set()
+        for _, _, item, store, price in hits:
+            compare_items.append(CompareItem(name=item, store=store, price=price))
+            store_totals[store] += price
+            found_items.add(item)
+
+        # Track unmatched items
+        unmatched: List[str] = [item for item in items if item not in found_items]
 
         # Build store totals list
         store_totals_list = [
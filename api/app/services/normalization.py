@@ -7,10 +7,14 @@ Phase 1 enhancements:
 - Provide `ProductSpec` builder that returns tokens, brand, variants, and matched rule hints.
 """
 
+import os
 import re
+import sys
+import time
 import unicodedata
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional
+from functools import lru_cache
+from typing import AbstractSet, Callable, FrozenSet, List, Dict, Optional, Tuple
 from pathlib import Path
 
 try:
@@ -61,6 +65,13 @@ SYNONYMS_MAP: Dict[str, str] = {
     "tomato sauce": "ketchup",
     "catsup": "ketchup",
 }
+# Interned so lookups with interned normalized names compare by identity
+SYNONYMS_MAP = {sys.intern(k): sys.intern(v) for k, v in SYNONYMS_MAP.items()}
+
+
+_RULES_PATH = Path(__file__).parent / "category_rules.yml"
+# Seconds between checks of the rules file's mtime; 0 checks on every access
+RULES_RECHECK_SECONDS = float(os.getenv("CATEGORY_RULES_RECHECK_SECONDS", "5"))
 
 
 def _load_category_rules() -> Dict[str, Dict[str, List[str]]]:
@@ -68,12 +79,13 @@ def _load_category_rules() -> Dict[str, Dict[str, List[str]]]:
 
     Returns a dict keyed by category with keys: base_terms, optional_terms, forbidden_terms
     """
-    rules_path = Path(__file__).parent / "category_rules.yml"
+    rules_path = _RULES_PATH
     if not rules_path.exists() or yaml is None:
         return {}
     try:
         with open(rules_path, "r", encoding="utf-8") as fh:
-            rules = yaml.safe_load(fh) or {}
+            # The libyaml-backed loader parses the same documents several times faster
+            rules = yaml.load(fh, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader)) or {}
             # Normalize lists to lower-case tokens
             normalized = {}
             for cat, data in rules.items():
@@ -87,28 +99,65 @@ def _load_category_rules() -> Dict[str, Dict[str, List[str]]]:
         return {}
 
 
-CATEGORY_RULES = _load_category_rules()
+# Offer titles, spec tokens and item names repeat heavily across scoring and
+# comparison passes, so the normalizers below are memoized.
+_NORMALIZE_CACHE_SIZE = 131072
+_INTERN_MAX_LEN = 32
+
+
+# Deletion table for combining marks (BMP), so accent stripping is one C-level translate
+_COMBINING_MARKS = str.maketrans(
+    "", "", "".join(chr(c) for c in range(0x10000) if unicodedata.combining(chr(c)))
+)
+_PUNCT_RE = re.compile(r"[^a-z0-9%\s]")
+# ASCII-only equivalent of _PUNCT_RE as a translate table (whitespace is kept for split())
+_ASCII_PUNCT = str.maketrans(
+    {
+        c: " "
+        for c in range(128)
+        if not (chr(c).isspace() or "a" <= chr(c) <= "z" or "0" <= chr(c) <= "9" or chr(c) == "%")
+    }
+)
+
+
+# Direct folds for the accented letters found in Spanish (and common Catalan/French) product
+# names; these map exactly to what NFKD + mark stripping produces for them
+_ACCENT_FOLD = str.maketrans(
+    "áéíóúüñàèìòùâêîôûçÁÉÍÓÚÜÑÀÈÌÒÙÂÊÎÔÛÇ",
+    "aeiouunaeiouaeioucAEIOUUNAEIOUAEIOUC",
+)
 
 
 def remove_accents(s: str) -> str:
     if not s:
         return ""
-    nkfd = unicodedata.normalize("NFKD", s)
-    return "".join([c for c in nkfd if not unicodedata.combining(c)])
+    s = s.translate(_ACCENT_FOLD)
+    if s.isascii():
+        return s
+    # anything else (other scripts, ligatures, fullwidth forms) takes the general path
+    return unicodedata.normalize("NFKD", s).translate(_COMBINING_MARKS)
 
 
+@lru_cache(maxsize=_NORMALIZE_CACHE_SIZE)
 def normalize_string(s: str) -> str:
     """Deterministic normalization: lowercase, remove accents, collapse whitespace."""
     if not s:
         return ""
-    s = s.strip().lower()
-    s = remove_accents(s)
-    # replace punctuation with space (keep alnum and %)
-    s = re.sub(r"[^a-z0-9%\s]", " ", s)
-    s = re.sub(r"\s+", " ", s).strip()
+    s = s.lower()
+    # replace punctuation with space (keep alnum and %), then collapse and trim whitespace
+    # with C-level split/join in the same step
+    if s.isascii():
+        # fast path for most inputs: nothing to fold, punctuation is a single translate
+        s = " ".join(s.translate(_ASCII_PUNCT).split())
+    else:
+        s = " ".join(_PUNCT_RE.sub(" ", remove_accents(s)).split())
+    # short results are typical product names/tokens that get reused as dict keys
+    if len(s) <= _INTERN_MAX_LEN:
+        s = sys.intern(s)
     return s
 
 
+@lru_cache(maxsize=_NORMALIZE_CACHE_SIZE)
 def normalize_item_name(s: str) -> str:
     """Backward-compatible wrapper that also applies synonyms map."""
     base = normalize_string(s)
@@ -120,46 +169,104 @@ def normalize_item_name(s: str) -> str:
     return base
 
 
+_ABBREVIATIONS = {
+    "oz": "ounce",
+    "lb": "pound",
+    "kg": "kilogram",
+    "g": "gram",
+    "ml": "milliliter",
+    "l": "liter",
+    "pk": "pack",
+    "ct": "count",
+    "pcs": "pieces",
+}
+# One alternation matched on whole whitespace-delimited words, so every abbreviation is
+# expanded in a single scan instead of one str.replace pass per entry
+_ABBREVIATION_RE = re.compile(r"(?<!\S)(" + "|".join(map(re.escape, _ABBREVIATIONS)) + r")(?!\S)")
+
+
+@lru_cache(maxsize=_NORMALIZE_CACHE_SIZE)
 def normalize_product_name(name: str) -> str:
     """Keep older API but use normalize_string and expand abbreviations."""
     if not name:
         return ""
     normalized = normalize_string(name)
-    abbreviations = {
-        " oz ": " ounce ",
-        " lb ": " pound ",
-        " kg ": " kilogram ",
-        " g ": " gram ",
-        " ml ": " milliliter ",
-        " l ": " liter ",
-        " pk ": " pack ",
-        " ct ": " count ",
-        " pcs ": " pieces ",
-    }
-    # pad and replace to avoid matching inside words
-    padded = f" {normalized} "
-    for k, v in abbreviations.items():
-        padded = padded.replace(k, v)
-    return padded.strip()
+    return _ABBREVIATION_RE.sub(lambda m: _ABBREVIATIONS[m.group(1)], normalized)
 
 
-def tokenize_product_name(name: str) -> List[str]:
+@lru_cache(maxsize=_NORMALIZE_CACHE_SIZE)
+def tokenize_product_name(name: str) -> Tuple[str, ...]:
+    # tuple so the cached result can be shared safely between callers
     normalized = normalize_product_name(name)
     if not normalized:
-        return []
-    return normalized.split()
+        return ()
+    return tuple(normalized.split())
+
+
+@lru_cache(maxsize=_NORMALIZE_CACHE_SIZE)
+def product_token_set(name: str) -> FrozenSet[str]:
+    """Cached frozenset of `tokenize_product_name` tokens, ready for similarity checks."""
+    return frozenset(tokenize_product_name(name))
+
+
+# cache_clear of caches kept in other modules that are built from normalized names or rules
+_dependent_cache_clears: List[Callable[[], None]] = []
+
+
+def register_dependent_cache(clear: Callable[[], None]) -> None:
+    """Have `clear` run with `clear_normalization_caches` and whenever the rules reload."""
+    _dependent_cache_clears.append(clear)
+
+
+def _clear_dependent_caches() -> None:
+    for clear in _dependent_cache_clears:
+        clear()
+
+
+def clear_normalization_caches() -> None:
+    """Empty the memoized normalizers (called once per scheduler tick to bound staleness)."""
+    normalize_string.cache_clear()
+    normalize_item_name.cache_clear()
+    normalize_product_name.cache_clear()
+    tokenize_product_name.cache_clear()
+    product_token_set.cache_clear()
+    _clear_dependent_caches()
 
 
 def calculate_similarity(name1: str, name2: str) -> float:
-    tokens1 = set(tokenize_product_name(name1))
-    tokens2 = set(tokenize_product_name(name2))
+    return token_similarity(product_token_set(name1), product_token_set(name2))
+
+
+def token_similarity(tokens1: AbstractSet[str], tokens2: AbstractSet[str]) -> float:
+    """Jaccard similarity of two pre-tokenized names.
+
+    Lets callers that compare one query against many names tokenize the query only once.
+    """
     if not tokens1 or not tokens2:
         return 0.0
-    intersection = tokens1.intersection(tokens2)
-    union = tokens1.union(tokens2)
-    if not union:
-        return 0.0
-    return len(intersection) / len(union)
+    # |A ∪ B| = |A| + |B| - |A ∩ B|: only the intersection needs to be materialized
+    common = len(tokens1.intersection(tokens2))
+    return common / (len(tokens1) + len(tokens2) - common)
+
+
+@lru_cache(maxsize=None)
+def get_base_terms(category: str) -> Tuple[str, ...]:
+    """Return the normalized base terms for a category (cached like `get_forbidden_terms`)."""
+    rules = get_category_rules().get(category, {})
+    terms = (normalize_string(t) for t in rules.get("base_terms", []) if t)
+    return tuple(t for t in terms if t)
+
+
+@lru_cache(maxsize=None)
+def get_forbidden_terms(category: str) -> Tuple[str, ...]:
+    """Return the normalized forbidden terms for a category.
+
+    Categories are a small, fixed set loaded from YAML, so the result is cached per category
+    instead of re-normalizing every term for every offer that is scored.
+    """
+    rules = get_category_rules().get(category, {})
+    terms = (normalize_string(t) for t in rules.get("forbidden_terms", []) if t)
+    return tuple(t for t in terms if t)
 
 
 @dataclass
@@ -170,23 +277,123 @@ class ProductSpec:
     category: Optional[str] = None
     variants: List[str] = field(default_factory=list)
     matched_rules: Dict[str, Dict[str, List[str]]] = field(default_factory=dict)
+    # Set views built once per spec, for the per-offer membership and overlap checks
+    tokens_set: FrozenSet[str] = field(init=False, repr=False, compare=False)
+    variants_set: FrozenSet[str] = field(init=False, repr=False, compare=False)
+    # Normalized forbidden terms of every matched category, deduplicated across categories
+    forbidden_set: FrozenSet[str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.tokens_set = frozenset(self.tokens or ())
+        self.variants_set = frozenset(v for v in self.variants or () if v)
+        self.forbidden_set = frozenset(
+            term for cat in self.matched_rules for term in get_forbidden_terms(cat)
+        )
+
+
+def _build_rule_sets(
+    rules: Dict[str, Dict[str, List[str]]]
+) -> Dict[str, Tuple[FrozenSet[str], FrozenSet[str], FrozenSet[str]]]:
+    """Per-category (base, optional, forbidden) frozensets for C-level intersections."""
+    return {
+        cat: (
+            frozenset(data.get("base_terms", [])),
+            frozenset(data.get("optional_terms", [])),
+            frozenset(data.get("forbidden_terms", [])),
+        )
+        for cat, data in rules.items()
+    }
+
+
+def _build_base_index(rules: Dict[str, Dict[str, List[str]]]) -> Dict[str, Tuple[str, ...]]:
+    """Inverted index: base term -> categories listing it, in rule-file order."""
+    index: Dict[str, List[str]] = {}
+    for cat, data in rules.items():
+        for term in data.get("base_terms", []):
+            cats = index.setdefault(term, [])
+            if cat not in cats:
+                cats.append(cat)
+    return {term: tuple(cats) for term, cats in index.items()}
 
 
-def _match_category_by_rules(tokens: List[str]) -> Dict[str, Dict[str, List[str]]]:
+class _RulesState:
+    """Parsed category rules plus the lookup structures derived from them."""
+
+    __slots__ = ("mtime", "checked_at", "rules", "rule_sets", "base_index", "order")
+
+    def __init__(self, mtime: Optional[int], rules: Dict[str, Dict[str, List[str]]]):
+        self.mtime = mtime
+        self.checked_at = time.monotonic()
+        self.rules = rules
+        self.rule_sets = _build_rule_sets(rules)
+        self.base_index = _build_base_index(rules)
+        self.order = {cat: i for i, cat in enumerate(rules)}
+
+
+_rules_state: Optional[_RulesState] = None
+
+
+def _rules_mtime() -> Optional[int]:
+    try:
+        return _RULES_PATH.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def _get_rules_state() -> _RulesState:
+    """Parse the rules file on first use and again whenever its mtime changes.
+
+    Deferring the parse keeps module import cheap (worker boot, test collection); the
+    mtime check lets an edited rules file take effect without a restart. The mtime is
+    read at most every RULES_RECHECK_SECONDS, not on every spec build.
+    """
+    global _rules_state
+    state = _rules_state
+    now = time.monotonic()
+    if state is not None and now - state.checked_at < RULES_RECHECK_SECONDS:
+        return state
+    mtime = _rules_mtime()
+    if state is None or state.mtime != mtime:
+        state = _RulesState(mtime, _load_category_rules())
+        _rules_state = state
+        # Everything derived from the old rules is stale now
+        get_base_terms.cache_clear()
+        get_forbidden_terms.cache_clear()
+        _clear_dependent_caches()
+    state.checked_at = now
+    return state
+
+
+def get_category_rules() -> Dict[str, Dict[str, List[str]]]:
+    """Return the category rules, loading (or reloading) `category_rules.yml` as needed."""
+    return _get_rules_state().rules
+
+
+def __getattr__(name: str):
+    # `CATEGORY_RULES` used to be loaded at import time; keep it importable, lazily.
+    # It is not in __all__ (flake8 F822): get_category_rules() is the public accessor.
+    if name == "CATEGORY_RULES":
+        return get_category_rules()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _match_category_by_rules(token_set: AbstractSet[str]) -> Dict[str, Dict[str, List[str]]]:
     """Return categories that match base_terms and any matched optional/forbidden tokens."""
     # Returns: category -> {matched_base, matched_optional, matched_forbidden}
     matches = {}
-    token_set = set(tokens)
-    for cat, data in CATEGORY_RULES.items():
-        base_hits = [t for t in data.get("base_terms", []) if t in token_set]
-        if not base_hits:
-            continue
-        opt_hits = [t for t in data.get("optional_terms", []) if t in token_set]
-        forb_hits = [t for t in data.get("forbidden_terms", []) if t in token_set]
+    # Walk the spec's few tokens through the inverted index instead of every category
+    state = _get_rules_state()
+    base_index = state.base_index
+    candidates = set()
+    for t in token_set:
+        candidates.update(base_index.get(t, ()))
+    # rule-file order is kept: the first matched category drives scoring
+    for cat in sorted(candidates, key=state.order.__getitem__):
+        base_set, opt_set, forb_set = state.rule_sets[cat]
         matches[cat] = {
-            "matched_base": base_hits,
-            "matched_optional": opt_hits,
-            "matched_forbidden": forb_hits,
+            "matched_base": sorted(token_set & base_set),
+            "matched_optional": sorted(token_set & opt_set),
+            "matched_forbidden": sorted(token_set & forb_set),
         }
     return matches
 
@@ -214,7 +421,8 @@ def build_product_spec(
             dedup_tokens.append(t)
             seen.add(t)
 
-    matched_rules = _match_category_by_rules(dedup_tokens)
+    # `seen` already is the spec's token set
+    matched_rules = _match_category_by_rules(seen)
     spec = ProductSpec(
         name=name,
         tokens=dedup_tokens,
@@ -241,10 +449,15 @@ __all__ = [
     "normalize_item_name",
     "normalize_product_name",
     "tokenize_product_name",
+    "product_token_set",
+    "clear_normalization_caches",
     "calculate_similarity",
+    "token_similarity",
     "SYNONYMS_MAP",
     "ProductSpec",
     "build_product_spec",
     "normalize_string",
-    "CATEGORY_RULES",
+    "get_category_rules",
+    "get_base_terms",
+    "get_forbidden_terms",
 ]
@@ -1,20 +1,91 @@
 """Service to refresh a shopping list: query scrapers, match offers, update DB."""
 
 import asyncio
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timezone
 import logging
+import multiprocessing
 import os
-from typing import List
+from typing import Dict, List, Optional
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
-from app.services.normalization import build_product_spec, summarize_spec
+from app.services.normalization import (
+    ProductSpec,
+    build_product_spec,
+    register_dependent_cache,
+    summarize_spec,
+)
 from app.services.scorer import filter_and_pick_best
 from app.services.scraper_service import ScraperService
-from app.models import ShoppingList
+from app.models import ShoppingList, ShoppingListItem
 from app.services import metrics
 
 logger = logging.getLogger(__name__)
 
 
+# Scoring is pure CPU work; large offer batches are scored in a process pool so they neither
+# block the event loop nor serialize on the GIL. Small batches stay inline, where pickling
+# the offers would cost more than scoring them.
+SCORING_OFFLOAD_THRESHOLD = int(os.getenv("SCORING_OFFLOAD_THRESHOLD", "200"))
+# Upper bound on items of one list being scraped at the same time
+REFRESH_CONCURRENCY = max(1, int(os.getenv("REFRESH_CONCURRENCY", "8")))
+_scoring_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_scoring_pool() -> ProcessPoolExecutor:
+    global _scoring_pool
+    if _scoring_pool is None:
+        # spawn, not fork: by now the process runs the browser loop, scraper and scheduler
+        # threads, and a forked child could inherit one of their locks held and hang
+        _scoring_pool = ProcessPoolExecutor(
+            max_workers=os.cpu_count(), mp_context=multiprocessing.get_context("spawn")
+        )
+    return _scoring_pool
+
+
+def shutdown_scoring_pool() -> None:
+    """Stop the scoring worker processes (called on app shutdown); a later batch restarts them."""
+    global _scoring_pool
+    pool, _scoring_pool = _scoring_pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def _pick_best(spec, offers: List[dict], top_k: int):
+    if len(offers) < SCORING_OFFLOAD_THRESHOLD:
+        return filter_and_pick_best(spec, offers, top_k=top_k)
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(
+            _get_scoring_pool(), filter_and_pick_best, spec, offers, top_k
+        )
+    except BrokenProcessPool:
+        # A worker died; drop the pool so the next large batch gets a fresh one
+        logger.exception("Scoring pool broke; recreating it, scoring %s offers inline", len(offers))
+        shutdown_scoring_pool()
+        return filter_and_pick_best(spec, offers, top_k=top_k)
+    except Exception:
+        logger.exception("Offloaded scoring failed; scoring %s offers inline", len(offers))
+        return filter_and_pick_best(spec, offers, top_k=top_k)
+
+
+@lru_cache(maxsize=8192)
+def _cached_spec(name, brand, category, variants_tuple) -> ProductSpec:
+    """Build (once) the spec of an item; items repeated within a refresh tick reuse it.
+
+    The returned spec is shared between callers and must be treated as read-only. Specs
+    embed the category rules they were built with, so the cache is cleared whenever the
+    rules reload and with the normalization caches on every scheduler tick.
+    """
+    variants = list(variants_tuple) if variants_tuple else None
+    return build_product_spec(name, brand=brand, category=category, variants=variants)
+
+
+register_dependent_cache(_cached_spec.cache_clear)
+
+
 def _make_query_from_spec(spec) -> str:
     parts = [spec.name]
     if spec.brand:
@@ -24,143 +95,204 @@ def _make_query_from_spec(spec) -> str:
     return " ".join([p for p in parts if p])
 
 
-async def async_refresh_shopping_list(list_id: int, db: Session) -> dict:
-    """Async implementation of the refresh flow.
-
-    This can be awaited from async endpoints or scheduled as a background task.
-    """
-    sl: ShoppingList = db.get(ShoppingList, list_id)
-    if not sl:
-        raise ValueError(f"ShoppingList {list_id} not found")
-
-    summary = {"list_id": list_id, "updated_items": 0, "errors": []}
-
-    for item in sl.items:
+async def _fetch_offers(query: str, scraper: ScraperService) -> List[dict]:
+    """Fetch offers for a query (with retry/backoff) and convert them to plain dicts."""
+    # Call scrapers with retry/backoff; if scraper fails after retries, continue
+    offers: List[dict] = []
+    max_retries = int(os.getenv("SCRAPER_MAX_RETRIES", "3"))
+    backoff = float(os.getenv("SCRAPER_BACKOFF_SECONDS", "0.5"))
+    attempt = 0
+    while attempt <= max_retries:
         try:
-            variants = (item.variants or "").split(",") if item.variants else None
-            spec = build_product_spec(
-                item.name, brand=item.brand, category=item.category, variants=variants
+            offers = await scraper.manager.aget_offers(query) or []
+            break
+        except Exception as e:
+            attempt += 1
+            logger.warning(
+                "Scraper error (attempt %s/%s) for query=%s: %s",
+                attempt,
+                max_retries,
+                query,
+                e,
             )
-            query = _make_query_from_spec(spec)
-
-            # Call scrapers with retry/backoff; if scraper fails after retries, continue
-            offers: List[dict] = []
-            max_retries = int(os.getenv("SCRAPER_MAX_RETRIES", "3"))
-            backoff = float(os.getenv("SCRAPER_BACKOFF_SECONDS", "0.5"))
-            attempt = 0
-            while attempt <= max_retries:
-                try:
-                    scraper = ScraperService(db)
-                    # ScraperManager.get_offers is sync; run in executor
-                    loop = asyncio.get_running_loop()
-                    func = scraper.manager.get_offers
-                    offers = await loop.run_in_executor(None, func, query) or []
-                    break
-                except Exception as e:
-                    attempt += 1
-                    logger.warning(
-                        "Scraper error (attempt %s/%s) for query=%s: %s",
-                        attempt,
-                        max_retries,
-                        query,
-                        e,
-                    )
-                    if attempt > max_retries:
-                        logger.exception(
-                            "Scraper failed after %s attempts for query=%s", max_retries, query
-                        )
-                        metrics.REFRESH_ERRORS_TOTAL.inc()
-                        offers = []
-                        break
-                    await asyncio.sleep(backoff * attempt)
-
-            # Convert offers to expected structure (name, price, category, etc.)
-            normalized_offers = []
-            for o in offers:
-                # Support Offer objects from ScraperManager or plain dicts
-                if hasattr(o, "to_dict"):
-                    od = o.to_dict()
-                elif isinstance(o, dict):
-                    od = o
-                else:
-                    # Fallback: build dict from attributes
-                    cat = getattr(o, "category", None) or getattr(o, "category_name", None)
-                    desc = (
-                        getattr(o, "subcategory", None)
-                        or getattr(o, "description", None)
-                        or getattr(o, "subcategory_name", "")
-                    )
-                    od = {
-                        "name": getattr(o, "name", None),
-                        "price": getattr(o, "price", None),
-                        "category": cat,
-                        "description": desc,
-                        "store": getattr(o, "store", ""),
-                        "url": getattr(o, "url", None) or getattr(o, "link", None),
-                    }
-
-                normalized_offers.append(
-                    {
-                        "name": od.get("name"),
-                        "price": od.get("price"),
-                        "category": od.get("category"),
-                        "description": od.get("subcategory") or od.get("description") or "",
-                        "store": od.get("store") or "",
-                        "url": od.get("url") or od.get("link") or None,
-                    }
+            if attempt > max_retries:
+                logger.exception(
+                    "Scraper failed after %s attempts for query=%s", max_retries, query
                 )
+                metrics.REFRESH_ERRORS_TOTAL.inc()
+                offers = []
+                break
+            await asyncio.sleep(backoff * attempt)
 
-            metrics.OFFERS_SCANNED_TOTAL.inc(len(normalized_offers))
+    # Convert offers to expected structure (name, price, category, etc.)
+    normalized_offers = []
+    for o in offers:
+        # Support Offer objects from ScraperManager or plain dicts
+        if hasattr(o, "to_dict"):
+            od = o.to_dict()
+        elif isinstance(o, dict):
+            od = o
+        else:
+            # Fallback: build dict from attributes
+            cat = getattr(o, "category", None) or getattr(o, "category_name", None)
+            desc = (
+                getattr(o, "subcategory", None)
+                or getattr(o, "description", None)
+                or getattr(o, "subcategory_name", "")
+            )
+            od = {
+                "name": getattr(o, "name", None),
+                "price": getattr(o, "price", None),
+                "category": cat,
+                "description": desc,
+                "store": getattr(o, "store", ""),
+                "url": getattr(o, "url", None) or getattr(o, "link", None),
+            }
 
-            best, ranked = filter_and_pick_best(spec, normalized_offers, top_k=10)
+        normalized_offers.append(
+            {
+                "name": od.get("name"),
+                "price": od.get("price"),
+                "category": od.get("category"),
+                "description": od.get("subcategory") or od.get("description") or "",
+                "store": od.get("store") or "",
+                "url": od.get("url") or od.get("link") or None,
+            }
+        )
+
+    return normalized_offers
+
+
+async def _refresh_item(
+    name, brand, category, variants_csv, scraper: ScraperService, query_cache: Dict
+) -> dict:
+    """Scrape and score one shopping-list item; returns the fields to write back.
+
+    Does no DB work so that several items can be evaluated concurrently on one session.
+    Items of one run that produce the same query share a single fetch via `query_cache`.
+    """
+    variants_tuple = tuple(variants_csv.split(",")) if variants_csv else None
+    spec = _cached_spec(name, brand, category, variants_tuple)
+    query = _make_query_from_spec(spec)
+
+    # Cache the in-flight task, not its result, so concurrent duplicates await one fetch
+    fetch = query_cache.get(query)
+    if fetch is None:
+        fetch = asyncio.ensure_future(_fetch_offers(query, scraper))
+        query_cache[query] = fetch
+    normalized_offers = await fetch
 
-            comparison = {
+    metrics.OFFERS_SCANNED_TOTAL.inc(len(normalized_offers))
+
+    if not normalized_offers:
+        # Nothing to score (no results, or the scrapers failed after retries)
+        return {
+            "best_store": None,
+            "best_price": None,
+            "best_url": None,
+            "comparison_json": {
                 "query": query,
-                "offers_count": len(normalized_offers),
-                "ranked": [
-                    {
-                        "name": r.get("name"),
-                        "store": r.get("store"),
-                        "price": r.get("_price"),
-                        "url": r.get("url"),
-                    }
-                    for r in ranked
-                ],
+                "offers_count": 0,
+                "ranked": [],
                 "selected": None,
                 "spec": summarize_spec(spec),
+            },
+        }
+
+    best, ranked = await _pick_best(spec, normalized_offers, top_k=10)
+
+    comparison = {
+        "query": query,
+        "offers_count": len(normalized_offers),
+        "ranked": [
+            {
+                "name": r.get("name"),
+                "store": r.get("store"),
+                "price": r.get("_price"),
+                "url": r.get("url"),
             }
+            for r in ranked
+        ],
+        "selected": None,
+        "spec": summarize_spec(spec),
+    }
 
-            if best:
-                item.best_store = best.get("store")
-                item.best_price = best.get("_price")
-                item.best_url = best.get("url")
-                comparison["selected"] = {
-                    "name": best.get("name"),
-                    "store": best.get("store"),
-                    "price": best.get("_price"),
-                    "url": best.get("url"),
-                }
-                metrics.BEST_SELECTED_TOTAL.inc()
-            else:
-                item.best_store = None
-                item.best_price = None
-                item.best_url = None
-
-            item.comparison_json = comparison
-            db.add(item)
-            db.commit()
-            db.refresh(item)
-
-            summary["updated_items"] += 1
+    result = {"best_store": None, "best_price": None, "best_url": None}
+    if best:
+        result = {
+            "best_store": best.get("store"),
+            "best_price": best.get("_price"),
+            "best_url": best.get("url"),
+        }
+        comparison["selected"] = {
+            "name": best.get("name"),
+            "store": best.get("store"),
+            "price": best.get("_price"),
+            "url": best.get("url"),
+        }
+        metrics.BEST_SELECTED_TOTAL.inc()
 
-        except Exception as e:
-            logger.exception("Error refreshing item %s: %s", item.id, e)
-            summary["errors"].append({"item_id": item.id, "error": str(e)})
+    result["comparison_json"] = comparison
+    return result
+
+
+async def async_refresh_shopping_list(list_id: int, db: Session) -> dict:
+    """Async implementation of the refresh flow.
+
+    This can be awaited from async endpoints or scheduled as a background task.
+    Items are scraped and scored concurrently (at most `REFRESH_CONCURRENCY` at a time);
+    all DB writes stay in this coroutine, on the caller's session.
+    """
+    if db.execute(select(ShoppingList.id).where(ShoppingList.id == list_id)).first() is None:
+        raise ValueError(f"ShoppingList {list_id} not found")
+
+    summary = {"list_id": list_id, "updated_items": 0, "errors": []}
+
+    # Plain (id, name, brand, category, variants) rows: one SELECT of just the columns the
+    # refresh reads, no ORM objects to load or track
+    rows = db.execute(
+        select(
+            ShoppingListItem.id,
+            ShoppingListItem.name,
+            ShoppingListItem.brand,
+            ShoppingListItem.category,
+            ShoppingListItem.variants,
+        )
+        .where(ShoppingListItem.shopping_list_id == list_id)
+        .order_by(ShoppingListItem.id)
+    ).all()
+    sem = asyncio.Semaphore(REFRESH_CONCURRENCY)
+    # One scraper facade for the whole list: scraper instances are built once, not per
+    # item and retry
+    scraper = ScraperService(db)
+    query_cache: Dict[str, asyncio.Future] = {}
+
+    async def bounded(row):
+        _, name, brand, category, variants = row
+        async with sem:
+            return await _refresh_item(name, brand, category, variants, scraper, query_cache)
+
+    results = await asyncio.gather(*(bounded(row) for row in rows), return_exceptions=True)
+
+    updates = []
+    for row, result in zip(rows, results):
+        item_id = row[0]
+        if isinstance(result, BaseException):
+            logger.error("Error refreshing item %s: %s", item_id, result, exc_info=result)
+            summary["errors"].append({"item_id": item_id, "error": str(result)})
+            continue
+        updates.append({"id": item_id, **result})
+    summary["updated_items"] = len(updates)
 
-    sl.last_refreshed = datetime.now(timezone.utc)
-    db.add(sl)
+    # One transaction: a bulk UPDATE by primary key for the items plus the list timestamp
+    if updates:
+        db.execute(update(ShoppingListItem), updates)
+    now_utc = datetime.now(timezone.utc)
+    db.execute(
+        update(ShoppingList).where(ShoppingList.id == list_id).values(last_refreshed=now_utc)
+    )
     db.commit()
-    summary["last_refreshed"] = sl.last_refreshed.isoformat()
+    summary["last_refreshed"] = now_utc.isoformat()
 
     return summary
 
@@ -4,16 +4,22 @@ This scheduler is intentionally simple: it runs an asyncio task that wakes up ev
 `REFRESH_INTERVAL_SECONDS` and refreshes shopping lists that haven't been refreshed
 within `REFRESH_THRESHOLD_SECONDS` (both configurable via environment variables).
 
+Each tick claims at most `REFRESH_BATCH_SIZE` due lists with `SELECT ... FOR UPDATE SKIP
+LOCKED` and stamps their `last_refreshed` in the same transaction, so several API
+instances running the scheduler split the work instead of refreshing the same lists.
+
 For production, consider using an external scheduler or worker (Celery/RQ/K8s CronJob).
 """
 
 import asyncio
 import os
 import logging
-import datetime
-from typing import Optional
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+from sqlalchemy import or_, select, update
 from app.db import SessionLocal
 from app.models import ShoppingList
+from app.services.normalization import clear_normalization_caches
 from app.services.refresh_service import async_refresh_shopping_list
 
 logger = logging.getLogger(__name__)
@@ -21,11 +27,40 @@ logger = logging.getLogger(__name__)
 # Configurable via env vars
 REFRESH_INTERVAL_SECONDS = int(os.getenv("REFRESH_INTERVAL_SECONDS", "300"))
 REFRESH_THRESHOLD_SECONDS = int(os.getenv("REFRESH_THRESHOLD_SECONDS", "3600"))
+REFRESH_BATCH_SIZE = int(os.getenv("REFRESH_BATCH_SIZE", "100"))
 
 _scheduler_task: Optional[asyncio.Task] = None
 _stop_event: Optional[asyncio.Event] = None
 
 
+def _claim_due_lists(db, cutoff, now) -> List[int]:
+    """Lock and claim up to REFRESH_BATCH_SIZE lists due for refresh; returns their ids.
+
+    Rows locked by another worker are skipped, and claimed rows get `last_refreshed = now`
+    before the transaction commits, so no other worker picks them up this round. Only ids
+    are selected; refresh loads each list itself.
+    """
+    stmt = (
+        select(ShoppingList.id)
+        .where(
+            or_(
+                ShoppingList.last_refreshed.is_(None),
+                ShoppingList.last_refreshed < cutoff,
+            )
+        )
+        .order_by(ShoppingList.last_refreshed.is_not(None), ShoppingList.last_refreshed)
+        .limit(REFRESH_BATCH_SIZE)
+        .with_for_update(skip_locked=True)
+    )
+    list_ids = db.execute(stmt).scalars().all()
+    if list_ids:
+        db.execute(
+            update(ShoppingList).where(ShoppingList.id.in_(list_ids)).values(last_refreshed=now)
+        )
+    db.commit()
+    return list_ids
+
+
 async def _scheduler_loop():
     logger.info(
         "Scheduler loop started (interval=%s s, threshold=%s s)",
@@ -36,24 +71,18 @@ async def _scheduler_loop():
         try:
             db = SessionLocal()
             try:
-                cutoff = datetime.datetime.utcnow() - datetime.timedelta(
-                    seconds=REFRESH_THRESHOLD_SECONDS
-                )
-                lists = (
-                    db.query(ShoppingList)
-                    .filter(
-                        (ShoppingList.last_refreshed.is_(None))
-                        | (ShoppingList.last_refreshed < cutoff)
-                    )
-                    .all()
-                )
-                if lists:
-                    logger.info("Scheduler found %s shopping lists to refresh", len(lists))
-                for sl in lists:
+                now = datetime.now(timezone.utc)
+                cutoff = now - timedelta(seconds=REFRESH_THRESHOLD_SECONDS)
+                list_ids = _claim_due_lists(db, cutoff, now)
+                if list_ids:
+                    logger.info("Scheduler found %s shopping lists to refresh", len(list_ids))
+                    # Names repeat within a tick, not necessarily across ticks
+                    clear_normalization_caches()
+                for list_id in list_ids:
                     try:
-                        await async_refresh_shopping_list(sl.id, db)
+                        await async_refresh_shopping_list(list_id, db)
                     except Exception as e:
-                        logger.exception("Error refreshing list %s: %s", sl.id, e)
+                        logger.exception("Error refreshing list %s: %s", list_id, e)
             finally:
                 db.close()
         except Exception as e:
@@ -3,8 +3,15 @@
 Implements hard filters, scoring heuristics and a filter->score->rank pipeline.
 """
 
-from typing import Dict, List, Optional, Tuple
-from app.services.normalization import ProductSpec, normalize_string, CATEGORY_RULES
+import heapq
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional, Tuple
+from app.services.normalization import (
+    ProductSpec,
+    normalize_string,
+    get_base_terms,
+)
 
 
 # Tunable weights
@@ -17,6 +24,56 @@ WEIGHTS = {
     "irrelevant_penalty": -20,
 }
 
+# score_offer runs once per offer: read the weights from module constants rather than
+# hashing into WEIGHTS on every use (edit WEIGHTS above; these follow it at import)
+_W_CATEGORY = WEIGHTS["category"]
+_W_CATEGORY_PARTIAL = WEIGHTS["category"] * 0.6
+_W_BRAND = WEIGHTS["brand"]
+_W_VARIANT = WEIGHTS["variant"]
+_W_TOKEN_OVERLAP = WEIGHTS["token_overlap"]
+_W_PRICE_BONUS = WEIGHTS["price_bonus"]
+
+
+@dataclass(frozen=True)
+class _PreparedSpec:
+    """Spec-derived values that are constant across a batch of offers."""
+
+    tokens: FrozenSet[str]
+    base_terms: Tuple[str, ...]
+    forbidden: Tuple[str, ...]
+    base_category: Optional[str]
+    brand: Optional[str]
+    variants: Tuple[str, ...]
+
+
+def _minimal_terms(terms) -> Tuple[str, ...]:
+    """Distinct terms for an any-substring test, minus those containing another term.
+
+    Text that contains "leche entera" also contains "leche", so for "is any term in the text"
+    the longer term never changes the answer and only costs another scan.
+    """
+    kept: List[str] = []
+    for term in sorted(set(terms), key=len):
+        if not any(k in term for k in kept):
+            kept.append(term)
+    return tuple(kept)
+
+
+def _prepare_spec(spec: ProductSpec) -> _PreparedSpec:
+    base_terms = _minimal_terms(term for cat in spec.matched_rules for term in get_base_terms(cat))
+    # first matched category with a base-term hit drives the category weight
+    base_category = next(
+        (cat for cat, match in spec.matched_rules.items() if match.get("matched_base")), None
+    )
+    return _PreparedSpec(
+        tokens=spec.tokens_set,
+        base_terms=base_terms,
+        forbidden=_minimal_terms(spec.forbidden_set),
+        base_category=base_category,
+        brand=spec.brand,
+        variants=tuple(spec.variants_set),
+    )
+
 
 def _safe_price(offer: Dict) -> Optional[float]:
     p = offer.get("price")
@@ -28,91 +85,118 @@ def _safe_price(offer: Dict) -> Optional[float]:
         return None
 
 
-def hard_filters_fail(spec: ProductSpec, offer: Dict) -> bool:
+@lru_cache(maxsize=4096)
+def _category_matches(category: str, offer_category: str) -> bool:
+    """Whether an offer's declared category names the spec category.
+
+    Offers carry a handful of distinct category strings, so the answer (normalization
+    included) is memoized per pair instead of being recomputed for every offer.
+    """
+    offer_cat = normalize_string(offer_category)
+    return bool(offer_cat) and category in offer_cat
+
+
+def _field_text(offer: Dict, key: str) -> str:
+    """Offer field as text: strings as-is, None/missing as "", anything else via str()."""
+    value = offer.get(key)
+    if isinstance(value, str):
+        return value
+    return "" if value is None else str(value)
+
+
+def _offer_text(offer: Dict) -> str:
+    """Normalized name + category + description text that filters and scoring run against."""
+    return normalize_string(
+        f"{_field_text(offer, 'name')} {_field_text(offer, 'category')} "
+        f"{_field_text(offer, 'description')}"
+    )
+
+
+def hard_filters_fail(
+    spec: ProductSpec,
+    offer: Dict,
+    prepared: Optional[_PreparedSpec] = None,
+    text: Optional[str] = None,
+) -> bool:
     """Return True if this offer should be rejected outright by hard filters."""
-    parts = [
-        str(offer.get("name") or ""),
-        str(offer.get("category") or ""),
-        str(offer.get("description") or ""),
-    ]
-    text = normalize_string(" ".join(parts))
+    if prepared is None:
+        prepared = _prepare_spec(spec)
+    if text is None:
+        text = _offer_text(offer)
 
     # Forbidden terms for any matched category should reject the offer.
-    # Use the canonical CATEGORY_RULES so we consider category-level forbidden terms
-    # even when the spec tokens didn't explicitly include them.
-    for cat in spec.matched_rules.keys():
-        rules = CATEGORY_RULES.get(cat, {})
-        for forb in rules.get("forbidden_terms", []):
-            # normalize forbidden token to be safe
-            if not forb:
-                continue
-            if normalize_string(forb) in text:
-                return True
-
-    # If the offer explicitly reports a category and spec has matched rules, prefer equality
-    if spec.category and offer.get("category"):
-        offer_cat = normalize_string(str(offer.get("category")))
-        if spec.category.lower().strip() != offer_cat:
-            # don't hard-fail here; only fail if offer category is clearly unrelated
-            pass
+    # Use the canonical category rules so we consider category-level forbidden terms
+    # even when the spec tokens didn't explicitly include them. They are normalized once per
+    # spec (ProductSpec.forbidden_set) and the offer text once per offer (_offer_text).
+    for forb in prepared.forbidden:
+        if forb in text:
+            return True
+
+    # The spec matched a category by its base terms ("leche", "huevo", ...); an offer that
+    # mentions none of them cannot be that product
+    if prepared.base_terms and not any(b in text for b in prepared.base_terms):
+        return True
+
+    # A differing offer category is not a hard failure: the category weight in score_offer
+    # already prefers offers whose declared category agrees with the spec.
 
     # If price missing entirely, don't hard fail; just deprioritize later
     return False
 
 
-def score_offer(spec: ProductSpec, offer: Dict, price_rank_score: float = 0.0) -> Optional[float]:
+def score_offer(
+    spec: ProductSpec,
+    offer: Dict,
+    price_rank_score: float = 0.0,
+    prepared: Optional[_PreparedSpec] = None,
+    text: Optional[str] = None,
+) -> Optional[float]:
     """Compute a numeric score for an offer. Return None if rejected."""
-    if hard_filters_fail(spec, offer):
+    if prepared is None:
+        prepared = _prepare_spec(spec)
+    if text is None:
+        text = _offer_text(offer)
+    if hard_filters_fail(spec, offer, prepared, text):
         return None
+    return _score_unchecked(offer, price_rank_score, prepared, text)
+
 
+def _score_unchecked(
+    offer: Dict, price_rank_score: float, prepared: _PreparedSpec, text: str
+) -> float:
+    """score_offer without the hard filters, for offers that already passed them."""
     score = 0.0
-    parts = [
-        str(offer.get("name") or ""),
-        str(offer.get("category") or ""),
-        str(offer.get("description") or ""),
-    ]
-    text = normalize_string(" ".join(parts))
-    tokens = set(spec.tokens or [])
-
-    # Category alignment
-    if spec.matched_rules:
-        # if any matched rule contains base match, give category weight
-        for cat, match in spec.matched_rules.items():
-            if match.get("matched_base"):
-                # if offer declares category and matches, give full; otherwise give smaller
-                offer_cat = normalize_string(str(offer.get("category") or ""))
-                if offer_cat and cat in offer_cat:
-                    score += WEIGHTS["category"]
-                else:
-                    score += WEIGHTS["category"] * 0.6
-                break
+
+    # Category alignment: if any matched rule contains base match, give category weight
+    cat = prepared.base_category
+    if cat is not None:
+        # if offer declares category and matches, give full; otherwise give smaller
+        if _category_matches(cat, _field_text(offer, "category")):
+            score += _W_CATEGORY
+        else:
+            score += _W_CATEGORY_PARTIAL
 
     # Brand match
-    if spec.brand:
-        if spec.brand in text:
-            score += WEIGHTS["brand"]
+    if prepared.brand:
+        if prepared.brand in text:
+            score += _W_BRAND
 
     # Variant match
-    for v in spec.variants:
-        if v and v in text:
-            score += WEIGHTS["variant"]
+    for v in prepared.variants:
+        if v in text:
+            score += _W_VARIANT
 
-    # Token overlap
-    overlap = len(tokens.intersection(set(text.split())))
-    score += overlap * WEIGHTS["token_overlap"]
+    # Token overlap: a single C-level intersection against the split text, skipped when the
+    # spec has no tokens to compare
+    if prepared.tokens:
+        overlap = len(prepared.tokens.intersection(text.split()))
+        score += overlap * _W_TOKEN_OVERLAP
 
     # Price rank helps but does not dominate
-    score += price_rank_score * WEIGHTS["price_bonus"]
-
-    # Penalize presence of explicit forbidden tokens across all matched categories
-    for cat in spec.matched_rules.keys():
-        rules = CATEGORY_RULES.get(cat, {})
-        for forb in rules.get("forbidden_terms", []):
-            if not forb:
-                continue
-            if normalize_string(forb) in text:
-                score += WEIGHTS["irrelevant_penalty"]
+    score += price_rank_score * _W_PRICE_BONUS
 
+    # No forbidden-term penalty pass here: any offer containing a forbidden term of a matched
+    # category was already rejected by the hard filter.
     return score
 
 
@@ -123,47 +207,63 @@ def filter_and_pick_best(
     if not offers:
         return None, []
 
-    # Normalize offers and attach safe price
-    normalized_offers = []
+    prepared = _prepare_spec(spec)
+
+    # One fused pass: normalize each offer's text once and apply the hard filters. Survivors
+    # are tracked in sidecar lists (offer, original index, safe price, text) rather than
+    # copied; only the offers that are returned get copied, below. Hot callables are bound
+    # locally.
+    offer_text = _offer_text
+    fails = hard_filters_fail
+    safe_price = _safe_price
+    kept: List[Dict] = []
+    kept_index: List[int] = []
+    kept_price: List[Optional[float]] = []
+    kept_text: List[str] = []
     for idx, o in enumerate(offers):
-        price = _safe_price(o)
-        # ensure minimal shape
-        normalized_offers.append({**o, "_orig_index": idx, "_price": price})
-
-    # Apply hard filters
-    filtered = [o for o in normalized_offers if not hard_filters_fail(spec, o)]
-
-    if not filtered:
+        text = offer_text(o)
+        if fails(spec, o, prepared, text):
+            continue
+        kept.append(o)
+        kept_index.append(idx)
+        kept_price.append(safe_price(o))
+        kept_text.append(text)
+
+    if not kept:
         return None, []
 
-    # Compute price rank score: cheaper offers get higher small bonus
-    def price_sort_key(x):
-        p = x.get("_price")
-        return (p is None, p if p is not None else float("inf"))
-
-    offers_with_price = sorted(filtered, key=price_sort_key)
-    price_rank_map = {
-        o["_orig_index"]: (len(offers_with_price) - i) / len(offers_with_price)
-        for i, o in enumerate(offers_with_price)
-    }
-
+    # Compute price rank score: cheaper offers get higher small bonus. Ranks are positional:
+    # sort the positions by price (None prices last, ties keep offer order) and write each
+    # offer's score into a list aligned with the sidecars.
+    n = len(kept)
+    inf = float("inf")
+    price_keys = [(p is None, p if p is not None else inf) for p in kept_price]
+    pr_scores = [0.0] * n
+    for rank, i in enumerate(sorted(range(n), key=price_keys.__getitem__)):
+        pr_scores[i] = (n - rank) / n
+
+    # Every offer here already passed the hard filters: score without re-running them
+    score = _score_unchecked
     scored = []
-    for o in filtered:
-        pr_score = price_rank_map.get(o.get("_orig_index"), 0.0)
-        s = score_offer(spec, o, price_rank_score=pr_score)
-        if s is not None:
-            scored.append((s, o))
-
-    if not scored:
-        return None, []
-
-    # Sort by score desc, then price asc (None prices last)
-    def sort_key(t):
-        p = t[1].get("_price")
-        return (-t[0], p if p is not None else float("inf"))
-
-    scored.sort(key=sort_key)
-    ranked = [o for _, o in scored]
-
-    best = ranked[0] if ranked else None
-    return best, ranked[:top_k]
+    for pos in range(n):
+        s = score(kept[pos], pr_scores[pos], prepared, kept_text[pos])
+        # Precomputed sort tuple: score desc, then price asc (None prices last); the
+        # original index breaks remaining ties stably, so positions are never compared
+        p = kept_price[pos]
+        scored.append((-s, p if p is not None else inf, kept_index[pos], pos))
+
+    if 0 < top_k < len(scored):
+        # Only the top-k are returned: a bounded heap selection instead of sorting every offer
+        top = heapq.nsmallest(top_k, scored)
+    else:
+        scored.sort()
+        top = scored[:top_k]
+
+    def result(entry) -> Dict:
+        # Returned offers are copies with the original index and safe price attached
+        pos = entry[3]
+        return {**kept[pos], "_orig_index": kept_index[pos], "_price": kept_price[pos]}
+
+    ranked = [result(t) for t in top]
+    best = ranked[0] if ranked else result(min(scored))
+    return best, ranked
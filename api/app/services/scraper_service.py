@@ -12,12 +12,13 @@ SOLID Principles:
 - DIP: Depends on ScraperManager abstraction
 """
 
+import asyncio
 import logging
 from typing import List, Optional, Dict, Any
 from decimal import Decimal
 from sqlalchemy.orm import Session
 
-from app.models import Product, Supermarket, Price
+from app.models import Product, Supermarket, Price, name_key
 from app.services.scrapers import ScraperManager, Offer
 
 logger = logging.getLogger(__name__)
@@ -36,35 +37,65 @@ class ScraperService:
     def __init__(self, db: Session):
         self.db = db
         self.manager = ScraperManager()
+        # name_key -> row for stores/products this service already resolved: a scrape run
+        # sees the same few stores (and many repeat products) on every query
+        self._store_cache: Dict[str, Supermarket] = {}
+        self._product_cache: Dict[str, Product] = {}
+
+    def _clear_caches(self) -> None:
+        """Forget resolved rows, e.g. after a rollback discarded some of them."""
+        self._store_cache.clear()
+        self._product_cache.clear()
 
     def get_or_create_supermarket(self, name: str, city: str = "Madrid") -> Supermarket:
-        """Get existing supermarket or create new one"""
-        store = self.db.query(Supermarket).filter(Supermarket.name.ilike(name)).first()
+        """Get existing supermarket or create new one (flushed, not committed)"""
+        key = name_key(name)
+        store = self._store_cache.get(key)
+        if store is not None:
+            return store
+
+        store = (
+            self.db.query(Supermarket)
+            .filter(Supermarket.name_key == key)
+            .order_by(Supermarket.id)
+            .first()
+        )
 
         if not store:
             store = Supermarket(name=name, city=city)
             self.db.add(store)
-            self.db.commit()
-            self.db.refresh(store)
-            logger.info(f"Created new supermarket: {name}")
+            self.db.flush()
+            logger.info("Created new supermarket: %s", name)
 
+        self._store_cache[key] = store
         return store
 
     def get_or_create_product(self, name: str, category: str = "General") -> Product:
-        """Get existing product or create new one"""
-        product = self.db.query(Product).filter(Product.name.ilike(name)).first()
+        """Get existing product or create new one (flushed, not committed)"""
+        key = name_key(name)
+        product = self._product_cache.get(key)
+        if product is not None:
+            return product
+
+        product = (
+            self.db.query(Product).filter(Product.name_key == key).order_by(Product.id).first()
+        )
 
         if not product:
             product = Product(name=name, category=category)
             self.db.add(product)
-            self.db.commit()
-            self.db.refresh(product)
-            logger.info(f"Created new product: {name}")
+            self.db.flush()
+            logger.info("Created new product: %s", name)
 
+        self._product_cache[key] = product
         return product
 
     def update_price(self, product: Product, store: Supermarket, price: float) -> Price:
-        """Update or create price entry"""
+        """Update or create price entry.
+
+        Like the get_or_create_* helpers this only flushes (assigning ids); the caller
+        commits once for all of its writes instead of paying a commit per price.
+        """
         price_entry = (
             self.db.query(Price)
             .filter(Price.product_id == product.id, Price.store_id == store.id)
@@ -74,7 +105,9 @@ class ScraperService:
         if price_entry:
             old_price = float(price_entry.price)
             price_entry.price = Decimal(str(price))
-            logger.info(f"Updated price for {product.name} at {store.name}: {old_price} -> {price}")
+            logger.info(
+                "Updated price for %s at %s: %s -> %s", product.name, store.name, old_price, price
+            )
         else:
             price_entry = Price(
                 product_id=product.id,
@@ -82,16 +115,50 @@ class ScraperService:
                 price=Decimal(str(price)),
             )
             self.db.add(price_entry)
-            logger.info(f"Created price for {product.name} at {store.name}: {price}")
+            logger.info("Created price for %s at %s: %s", product.name, store.name, price)
 
-        self.db.commit()
-        self.db.refresh(price_entry)
+        self.db.flush()
         return price_entry
 
+    def _resolve_by_name(self, model, names, factory, cache: Dict[str, Any]) -> Dict[str, Any]:
+        """Map name key -> row for `names`, creating the missing rows.
+
+        Rows already in `cache` are reused; the rest are found with one indexed SELECT on
+        `name_key`, the missing ones are inserted in one flush, and all of them are cached.
+        """
+        found: Dict[str, Any] = {}
+        wanted: Dict[str, str] = {}
+        for name in names:
+            key = name_key(name)
+            row = cache.get(key)
+            if row is not None:
+                found[key] = row
+            else:
+                wanted.setdefault(key, name)
+        if not wanted:
+            return found
+
+        rows = self.db.query(model).filter(model.name_key.in_(list(wanted))).order_by(model.id)
+        for row in rows:
+            if row.name_key not in found:
+                found[row.name_key] = cache[row.name_key] = row
+
+        missing = [factory(name) for key, name in wanted.items() if key not in found]
+        if missing:
+            self.db.add_all(missing)
+            self.db.flush()
+            for row in missing:
+                found[row.name_key] = cache[row.name_key] = row
+                logger.info("Created new %s: %s", model.__name__.lower(), row.name)
+        return found
+
     def process_offers(self, offers: List[Offer]) -> Dict[str, Any]:
         """
         Process a list of offers and update the database.
 
+        Stores, products and existing prices for the whole batch are loaded with one query
+        each, new rows are inserted together, and everything is committed once.
+
         Args:
             offers: List of Offer objects from scrapers
 
@@ -104,41 +171,75 @@ class ScraperService:
             "updated": 0,
             "errors": [],
         }
+        if not offers:
+            return results
 
-        for offer in offers:
-            try:
-                # Get or create store
-                store = self.get_or_create_supermarket(offer.store)
-
-                # Get or create product
-                product = self.get_or_create_product(offer.name)
+        try:
+            stores = self._resolve_by_name(
+                Supermarket,
+                {o.store for o in offers},
+                lambda n: Supermarket(name=n, city="Madrid"),
+                self._store_cache,
+            )
+            products = self._resolve_by_name(
+                Product,
+                {o.name for o in offers},
+                lambda n: Product(name=n, category="General"),
+                self._product_cache,
+            )
 
-                # Check if this is an update or create
-                existing = (
-                    self.db.query(Price)
-                    .filter(Price.product_id == product.id, Price.store_id == store.id)
-                    .first()
+            prices: Dict[tuple, Price] = {}
+            rows = (
+                self.db.query(Price)
+                .filter(
+                    Price.product_id.in_([p.id for p in products.values()]),
+                    Price.store_id.in_([s.id for s in stores.values()]),
                 )
+                .order_by(Price.id)
+            )
+            for row in rows:
+                prices.setdefault((row.product_id, row.store_id), row)
+
+            for offer in offers:
+                try:
+                    store = stores[name_key(offer.store)]
+                    product = products[name_key(offer.name)]
+                    value = Decimal(str(offer.price))
+
+                    key = (product.id, store.id)
+                    entry = prices.get(key)
+                    if entry is not None:
+                        entry.price = value
+                        results["updated"] += 1
+                    else:
+                        entry = Price(product_id=product.id, store_id=store.id, price=value)
+                        self.db.add(entry)
+                        prices[key] = entry
+                        results["created"] += 1
+                    results["processed"] += 1
+
+                except Exception as e:
+                    results["errors"].append(
+                        {
+                            "offer": offer.name,
+                            "store": offer.store,
+                            "error": str(e),
+                        }
+                    )
+                    logger.error("Error processing offer %s: %s", offer.name, e)
 
-                if existing:
-                    results["updated"] += 1
-                else:
-                    results["created"] += 1
-
-                # Update price
-                self.update_price(product, store, offer.price)
-                results["processed"] += 1
-
-            except Exception as e:
-                results["errors"].append(
-                    {
-                        "offer": offer.name,
-                        "store": offer.store,
-                        "error": str(e),
-                    }
-                )
-                logger.error(f"Error processing offer {offer.name}: {e}")
-
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            self._clear_caches()
+            raise
+
+        logger.info(
+            "Processed %s offers: %s prices created, %s updated",
+            results["processed"],
+            results["created"],
+            results["updated"],
+        )
         return results
 
     async def scrape_product(self, query: str, store: Optional[str] = None) -> Dict[str, Any]:
@@ -152,48 +253,60 @@ class ScraperService:
         Returns:
             Dictionary with results summary
         """
-        logger.info(f"Scraping for query: {query}, store: {store or 'all'}")
+        logger.info("Scraping for query: %s, store: %s", query, store or "all")
 
         try:
-            # Get offers from scraper(s)
+            # Get offers from scraper(s); the scrapers block, so they run in a worker thread
             if store:
-                offers = self.manager.get_offers_by_store(query, store)
+                offers = await asyncio.to_thread(self.manager.get_offers_by_store, query, store)
             else:
-                offers = self.manager.get_offers(query)
-
-            if not offers:
-                return {
-                    "status": "no_results",
-                    "message": f"No products found for: {query}",
-                    "query": query,
-                    "store": store,
-                    "offers_found": 0,
-                    "processed": 0,
-                }
-
-            # Process offers into database
-            results = self.process_offers(offers)
+                offers = await self.manager.aget_offers(query)
 
-            return {
-                "status": "success",
-                "message": f"Processed {results['processed']} products",
-                "query": query,
-                "store": store,
-                "offers_found": len(offers),
-                **results,
-            }
+            return self._save_offers(query, store, offers)
 
         except Exception as e:
-            logger.error(f"Error scraping for {query}: {e}")
+            logger.error("Error scraping for %s: %s", query, e)
+            return self._error_result(query, store, e)
+
+    def _save_offers(self, query: str, store: Optional[str], offers: List[Offer]) -> Dict[str, Any]:
+        """Write the offers scraped for one query and summarize them (as scrape_product does)."""
+        if not offers:
             return {
-                "status": "error",
-                "message": str(e),
+                "status": "no_results",
+                "message": f"No products found for: {query}",
                 "query": query,
                 "store": store,
                 "offers_found": 0,
                 "processed": 0,
             }
 
+        # Process offers into database
+        try:
+            results = self.process_offers(offers)
+        except Exception as e:
+            logger.error("Error saving offers for %s: %s", query, e)
+            return self._error_result(query, store, e)
+
+        return {
+            "status": "success",
+            "message": f"Processed {results['processed']} products",
+            "query": query,
+            "store": store,
+            "offers_found": len(offers),
+            **results,
+        }
+
+    @staticmethod
+    def _error_result(query: str, store: Optional[str], error: Exception) -> Dict[str, Any]:
+        return {
+            "status": "error",
+            "message": str(error),
+            "query": query,
+            "store": store,
+            "offers_found": 0,
+            "processed": 0,
+        }
+
     async def scrape_all_products(self, queries: Optional[List[str]] = None) -> Dict[str, Any]:
         """
         Scrape multiple products and update database.
@@ -230,9 +343,22 @@ class ScraperService:
             "details": [],
         }
 
+        # One batch for all queries: stores search concurrently, each store sees one query
+        # at a time (or loads them together, like Carrefour). DB writes then run here, on
+        # this event loop's thread, one query at a time.
+        scrape_error: Optional[Exception] = None
+        try:
+            offers_by_query = await self.manager.aget_offers_many(queries)
+        except Exception as e:
+            logger.error("Error scraping %s queries: %s", len(queries), e)
+            offers_by_query, scrape_error = {}, e
+
         for query in queries:
             try:
-                result = await self.scrape_product(query)
+                if scrape_error is not None:
+                    result = self._error_result(query, None, scrape_error)
+                else:
+                    result = self._save_offers(query, None, offers_by_query[query])
                 all_results["details"].append(result)
                 all_results["total_offers_found"] += result.get("offers_found", 0)
                 all_results["total_processed"] += result.get("processed", 0)
@@ -11,6 +11,7 @@ Components:
 - Offer: Normalized data model for scraped products
 - ScraperFactory: Factory for creating scraper instances
 - ScraperManager: Facade that unifies all scrapers
+- browser: Shared Playwright runtime (one browser on a persistent event loop)
 
 Available Scrapers:
 - MercadonaScraper: Full Playwright-based live implementation
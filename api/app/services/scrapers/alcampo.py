@@ -5,28 +5,35 @@ Uses Playwright to intercept API responses for reliable data extraction.
 Implements BaseScraper interface for unified data acquisition layer.
 """
 
-import asyncio
 import logging
 import re
 from typing import List, Optional
 
-from .base import BaseScraper, Offer, ScraperFactory, normalize_text, extract_brand
+from .base import (
+    DEFAULT_MAX_RESULTS,
+    BaseScraper,
+    Offer,
+    ScraperFactory,
+    build_fallback_index,
+    match_fallback,
+    normalize_text,
+    extract_brand,
+)
+from .browser import PLAYWRIGHT_AVAILABLE, get_browser, run_coroutine
 
 logger = logging.getLogger(__name__)
 
-try:
-    from playwright.async_api import async_playwright
-
-    PLAYWRIGHT_AVAILABLE = True
-except ImportError:
-    PLAYWRIGHT_AVAILABLE = False
+if not PLAYWRIGHT_AVAILABLE:
     logger.warning("Playwright not available - Alcampo live scraping disabled")
 
 
+_PRICE_RE = re.compile(r"(\d+[.,]\d+)")
+
+
 def _extract_price_from_text(text: str) -> Optional[float]:
     if not text:
         return None
-    match = re.search(r"(\d+[.,]\d+)", str(text))
+    match = _PRICE_RE.search(text if isinstance(text, str) else str(text))
     if match:
         return float(match.group(1).replace(",", "."))
     return None
@@ -53,64 +60,86 @@ async def _search_alcampo_playwright(query: str, max_results: int = 20) -> List[
     products = []
     api_responses = []
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        context = await browser.new_context(
-            user_agent=(
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 Chrome/120.0.0.0 Safari/537.36"
-            ),
-            locale="es-ES",
+    browser = await get_browser()
+    context = await browser.new_context(
+        user_agent=(
+            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+            "AppleWebKit/537.36 Chrome/120.0.0.0 Safari/537.36"
+        ),
+        locale="es-ES",
+    )
+    page = await context.new_page()
+
+    async def handle_response(response):
+        url = response.url
+        if ("search" in url or "product" in url) and "api" in url:
+            try:
+                if "application/json" in response.headers.get("content-type", ""):
+                    data = await response.json()
+                    api_responses.append(data)
+            except Exception:
+                pass
+
+    page.on("response", handle_response)
+
+    try:
+        await page.goto(
+            f"https://www.compraonline.alcampo.es/search?q={query}",
+            wait_until="networkidle",
+            timeout=30000,
         )
-        page = await context.new_page()
+        # networkidle already covers the search requests; only linger for late
+        # responses when nothing has been captured yet
+        if not api_responses:
+            await page.wait_for_timeout(2000)
 
-        async def handle_response(response):
-            url = response.url
-            if ("search" in url or "product" in url) and "api" in url:
-                try:
-                    if "application/json" in response.headers.get("content-type", ""):
-                        data = await response.json()
-                        api_responses.append(data)
-                except Exception:
-                    pass
+        for data in api_responses:
+            if isinstance(data, dict):
+                prods = data.get("products", []) or data.get("results", []) or data.get("items", [])
+                products.extend(prods)
 
-        page.on("response", handle_response)
+    except Exception as e:
+        logger.warning("Playwright Alcampo error: %s", e)
+    finally:
+        await context.close()
 
-        try:
-            await page.goto(
-                f"https://www.compraonline.alcampo.es/search?q={query}",
-                wait_until="networkidle",
-                timeout=30000,
-            )
-            await page.wait_for_timeout(2000)
+    return products[:max_results]
 
-            for data in api_responses:
-                if isinstance(data, dict):
-                    prods = (
-                        data.get("products", []) or data.get("results", []) or data.get("items", [])
-                    )
-                    products.extend(prods)
 
-        except Exception as e:
-            logger.warning(f"Playwright Alcampo error: {e}")
-        finally:
-            await browser.close()
+_FALLBACK_DATA = {
+    "leche": [
+        ("Leche entera Auchan 1L", 0.82, "Auchan"),
+        ("Leche semidesnatada Puleva 1L", 1.15, "Puleva"),
+        ("Leche sin lactosa Auchan 1L", 1.25, "Auchan"),
+        ("Leche entera Asturiana 1L", 1.09, "Asturiana"),
+    ],
+    "huevos": [("Huevos frescos L Auchan 12 unidades", 2.35, "Auchan")],
+    "pan": [("Pan de molde Auchan 450g", 1.05, "Auchan")],
+    "arroz": [("Arroz redondo Auchan 1kg", 1.25, "Auchan")],
+    "aceite": [("Aceite oliva virgen extra Auchan 1L", 6.79, "Auchan")],
+    "yogur": [("Yogur natural Auchan pack 4", 1.05, "Auchan")],
+    "pasta": [("Espaguetis Auchan 500g", 0.75, "Auchan")],
+    "pollo": [("Pechuga pollo Auchan 500g", 4.65, "Auchan")],
+    "tomate": [("Tomate frito Auchan 400g", 0.85, "Auchan")],
+    "agua": [("Agua mineral Auchan 6x1.5L", 1.55, "Auchan")],
+}
 
-    return products[:max_results]
+_FALLBACK_INDEX = build_fallback_index(_FALLBACK_DATA)
 
 
 class AlcampoScraper(BaseScraper):
     STORE_NAME = "Alcampo"
+    NORMALIZES_OWN_NAMES = True
     BASE_URL = "https://www.compraonline.alcampo.es"
 
-    def _fetch_products(self, query: str) -> List[Offer]:
-        self.logger.info(f"Searching Alcampo for: {query}")
+    def _fetch_products(self, query: str, max_results: int = DEFAULT_MAX_RESULTS) -> List[Offer]:
+        self.logger.info("Searching Alcampo for: %s", query)
 
         if not PLAYWRIGHT_AVAILABLE:
-            return self._fallback_search(query)
+            return self._fallback_search(query, max_results)
 
         try:
-            products = asyncio.run(_search_alcampo_playwright(query))
+            products = run_coroutine(_search_alcampo_playwright(query, max_results))
 
             if products:
                 offers = []
@@ -123,7 +152,8 @@ class AlcampoScraper(BaseScraper):
                     if not price or price <= 0:
                         continue
 
-                    brand = product.get("brand") or extract_brand(name)
+                    name_normalized = normalize_text(name)
+                    brand = product.get("brand") or extract_brand(name, name_normalized)
                     if brand and brand.lower() == "alcampo":
                         brand = "Auchan"
 
@@ -135,76 +165,40 @@ class AlcampoScraper(BaseScraper):
                             price=float(price),
                             url=product.get("url") or f"{self.BASE_URL}/search?q={query}",
                             image_url=product.get("image"),
-                            normalized_name=normalize_text(name),
+                            normalized_name=name_normalized,
                         )
                     )
 
                 if offers:
-                    self.logger.info(f"Alcampo returned {len(offers)} live products")
+                    self.logger.info("Alcampo returned %s live products", len(offers))
                     return offers
 
-            return self._fallback_search(query)
+            return self._fallback_search(query, max_results)
 
         except Exception as e:
-            self.logger.warning(f"Alcampo error: {e}")
-            return self._fallback_search(query)
+            self.logger.warning("Alcampo error: %s", e)
+            return self._fallback_search(query, max_results)
 
-    def _fallback_search(self, query: str) -> List[Offer]:
+    def _fallback_search(self, query: str, max_results: int = DEFAULT_MAX_RESULTS) -> List[Offer]:
         self.logger.info("Using Alcampo fallback data")
-        fallback_data = {
-            "leche": [
-                ("Leche entera Auchan 1L", 0.82, "Auchan"),
-                ("Leche semidesnatada Puleva 1L", 1.15, "Puleva"),
-                ("Leche sin lactosa Auchan 1L", 1.25, "Auchan"),
-                ("Leche entera Asturiana 1L", 1.09, "Asturiana"),
-            ],
-            "huevos": [("Huevos frescos L Auchan 12 unidades", 2.35, "Auchan")],
-            "pan": [("Pan de molde Auchan 450g", 1.05, "Auchan")],
-            "arroz": [("Arroz redondo Auchan 1kg", 1.25, "Auchan")],
-            "aceite": [("Aceite oliva virgen extra Auchan 1L", 6.79, "Auchan")],
-            "yogur": [("Yogur natural Auchan pack 4", 1.05, "Auchan")],
-            "pasta": [("Espaguetis Auchan 500g", 0.75, "Auchan")],
-            "pollo": [("Pechuga pollo Auchan 500g", 4.65, "Auchan")],
-            "tomate": [("Tomate frito Auchan 400g", 0.85, "Auchan")],
-            "agua": [("Agua mineral Auchan 6x1.5L", 1.55, "Auchan")],
-        }
-
-        query_lower = normalize_text(query)
-        offers = []
-
-        for category, products in fallback_data.items():
-            if query_lower in category or category in query_lower:
-                for name, price, brand in products:
-                    offers.append(
-                        Offer(
-                            store=self.STORE_NAME,
-                            name=name,
-                            brand=brand,
-                            price=price,
-                            url=f"{self.BASE_URL}/search?q={query}",
-                            normalized_name=normalize_text(name),
-                        )
-                    )
-
-        if not offers:
-            for category, products in fallback_data.items():
-                for name, price, brand in products:
-                    if query_lower in normalize_text(name):
-                        offers.append(
-                            Offer(
-                                store=self.STORE_NAME,
-                                name=name,
-                                brand=brand,
-                                price=price,
-                                url=f"{self.BASE_URL}/search?q={query}",
-                                normalized_name=normalize_text(name),
-                            )
-                        )
-        return offers
+        matches = match_fallback(_FALLBACK_INDEX, normalize_text(query))[:max_results]
+        url = f"{self.BASE_URL}/search?q={query}"
+        # Static data, valid by construction: skip per-field validation
+        return [
+            Offer.model_construct(
+                store=self.STORE_NAME,
+                name=name,
+                brand=brand,
+                price=price,
+                url=url,
+                normalized_name=name_normalized,
+            )
+            for name, name_normalized, price, brand in matches
+        ]
 
 
 ScraperFactory.register("alcampo", AlcampoScraper)
 
 
 def scrape_alcampo(query: str) -> List[Offer]:
-    return AlcampoScraper().search(query)
+    return ScraperFactory.create("alcampo").search(query)
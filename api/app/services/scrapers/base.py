@@ -15,9 +15,12 @@ SOLID Principles:
 import re
 import time
 import logging
+import threading
 import unicodedata
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 from pydantic import BaseModel, Field
 
 logger = logging.getLogger(__name__)
@@ -65,6 +68,28 @@ class Offer(BaseModel):
         }
 
 
+def _strip_marks(text: str) -> str:
+    """Drop combining marks after NFD decomposition (á -> a, ñ -> n)."""
+    decomposed = unicodedata.normalize("NFD", text)
+    return "".join(c for c in decomposed if unicodedata.category(c) != "Mn")
+
+
+# Precomputed accent folding for Latin-1 and Latin Extended-A (Spanish, Catalan,
+# Portuguese, ...), derived from the NFD rule so both paths agree
+_ACCENT_TABLE = str.maketrans(
+    {
+        c: _strip_marks(c)
+        for c in map(chr, range(0xC0, 0x180))
+        if _strip_marks(c) != c and _strip_marks(c).isascii()
+    }
+)
+
+
+# Offers returned per store and query unless the caller asks for another limit
+DEFAULT_MAX_RESULTS = 20
+
+
+@lru_cache(maxsize=8192)
 def normalize_text(text: str) -> str:
     """
     Normalize text for matching:
@@ -73,6 +98,9 @@ def normalize_text(text: str) -> str:
     - Collapse whitespace
     - Strip leading/trailing whitespace
 
+    Results are memoized: queries, product names and category keys repeat across
+    searches and scrapers, so repeat calls skip the Unicode decomposition.
+
     Args:
         text: Raw text to normalize
 
@@ -82,30 +110,53 @@ def normalize_text(text: str) -> str:
     if not text:
         return ""
 
-    # Remove accents using Unicode normalization
-    # NFD decomposes characters, then we filter out combining marks
-    normalized = unicodedata.normalize("NFD", text)
-    normalized = "".join(c for c in normalized if unicodedata.category(c) != "Mn")
-
-    # Lowercase
-    normalized = normalized.lower()
-
-    # Collapse whitespace
-    normalized = re.sub(r"\s+", " ", normalized)
-
-    # Strip
-    normalized = normalized.strip()
-
-    return normalized
-
-
-def extract_brand(name: str) -> Optional[str]:
+    # Remove accents: common ones through the table, anything else non-ASCII via NFD
+    normalized = text
+    if not normalized.isascii():
+        normalized = normalized.translate(_ACCENT_TABLE)
+        if not normalized.isascii():
+            normalized = _strip_marks(normalized)
+
+    # Lowercase, collapse whitespace and strip (split() does both in one pass)
+    return " ".join(normalized.lower().split())
+
+
+# Known Spanish supermarket brands
+_KNOWN_BRANDS = (
+    "hacendado",
+    "carrefour",
+    "alcampo",
+    "auchan",
+    "dia",
+    "eroski",
+    "mercadona",
+    "lidl",
+    "aldi",
+    "danone",
+    "nestle",
+    "pascual",
+    "puleva",
+    "central lechera",
+)
+
+# One pass over the name for all brands; longest first so "central lechera" wins at a position
+_BRAND_RE = re.compile(
+    r"\b(" + "|".join(map(re.escape, sorted(_KNOWN_BRANDS, key=len, reverse=True))) + r")\b"
+)
+
+# Common Spanish product words that are never a brand
+_SKIP_WORDS = frozenset({"leche", "pan", "agua", "aceite", "arroz", "pasta", "huevos", "yogur"})
+
+
+def extract_brand(name: str, normalized_name: Optional[str] = None) -> Optional[str]:
     """
     Simple heuristic to extract brand from product name.
-    Looks for first capitalized word or known brand patterns.
+    Looks for the first known brand (as a whole word) or a capitalized first word.
 
     Args:
         name: Product name
+        normalized_name: normalize_text(name), if the caller already has it;
+            known brands are always matched on the normalized name
 
     Returns:
         Extracted brand or None
@@ -113,41 +164,72 @@ def extract_brand(name: str) -> Optional[str]:
     if not name:
         return None
 
-    # Known Spanish supermarket brands
-    known_brands = {
-        "hacendado",
-        "carrefour",
-        "alcampo",
-        "auchan",
-        "dia",
-        "eroski",
-        "mercadona",
-        "lidl",
-        "aldi",
-        "danone",
-        "nestle",
-        "pascual",
-        "puleva",
-        "central lechera",
-    }
-
-    name_lower = name.lower()
-    for brand in known_brands:
-        if brand in name_lower:
-            return brand.title()
+    match = _BRAND_RE.search(normalized_name or normalize_text(name))
+    if match:
+        return match.group(1).title()
 
     # Fallback: first word if it looks like a brand (capitalized, not common word)
     words = name.split()
     if words:
         first_word = words[0]
-        # Skip common Spanish product words
-        skip_words = {"leche", "pan", "agua", "aceite", "arroz", "pasta", "huevos", "yogur"}
-        if first_word.lower() not in skip_words and len(first_word) > 2:
+        if first_word.lower() not in _SKIP_WORDS and len(first_word) > 2:
             return first_word
 
     return None
 
 
+# (name, normalized name, price, brand) for one static fallback product
+FallbackEntry = Tuple[str, str, float, Optional[str]]
+
+
+@dataclass(frozen=True, eq=False)
+class FallbackIndex:
+    """Static fallback products keyed by normalized category, normalized once at import.
+
+    Compared and hashed by identity, so it is a cheap lru_cache key.
+    """
+
+    categories: Tuple[Tuple[str, Tuple[FallbackEntry, ...]], ...]
+
+
+def build_fallback_index(data: Dict[str, List[Tuple[str, float, Optional[str]]]]) -> FallbackIndex:
+    """Build a FallbackIndex from a store's {category: [(name, price, brand), ...]} data."""
+    return FallbackIndex(
+        tuple(
+            (
+                normalize_text(category),
+                tuple(
+                    (name, normalize_text(name), price, brand) for name, price, brand in products
+                ),
+            )
+            for category, products in data.items()
+        )
+    )
+
+
+@lru_cache(maxsize=4096)
+def match_fallback(index: FallbackIndex, query_normalized: str) -> Tuple[FallbackEntry, ...]:
+    """Fallback products for a normalized query: category matches first, else name matches.
+
+    Matching is by substring, so it cannot be answered by a token lookup; instead the
+    result for each distinct (index, query) pair is cached, and repeat queries skip the scan.
+    """
+    matches = tuple(
+        entry
+        for category, entries in index.categories
+        if query_normalized in category or category in query_normalized
+        for entry in entries
+    )
+    if matches:
+        return matches
+    return tuple(
+        entry
+        for _, entries in index.categories
+        for entry in entries
+        if query_normalized in entry[1]
+    )
+
+
 class BaseScraper(ABC):
     """
     Abstract base class for all scrapers.
@@ -164,11 +246,14 @@ class BaseScraper(ABC):
     """
 
     STORE_NAME: str = "Unknown"
+    # True when _fetch_products sets normalized_name on every Offer it returns,
+    # so search() can skip its own normalization pass
+    NORMALIZES_OWN_NAMES: bool = False
 
     def __init__(self):
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
 
-    def search(self, query: str) -> List[Offer]:
+    def search(self, query: str, max_results: int = DEFAULT_MAX_RESULTS) -> List[Offer]:
         """
         Template method: Search for products matching query.
 
@@ -182,25 +267,27 @@ class BaseScraper(ABC):
 
         Args:
             query: Search query string
+            max_results: Upper bound on the number of offers returned
 
         Returns:
             List of Offer objects, empty list on error (graceful degradation)
         """
         start_time = time.time()
-        self.logger.info(f"Starting search for: {query!r}")
+        self.logger.info("Starting search for: %r", query)
 
         try:
             # Fetch raw products from store
-            offers = self._fetch_products(query)
+            offers = self._fetch_products(query, max_results)[:max_results]
 
             # Apply normalization to all offers
-            for offer in offers:
-                if not offer.normalized_name:
-                    offer.normalized_name = normalize_text(offer.name)
+            if not self.NORMALIZES_OWN_NAMES:
+                for offer in offers:
+                    if not offer.normalized_name:
+                        offer.normalized_name = normalize_text(offer.name)
 
             elapsed = time.time() - start_time
             self.logger.info(
-                f"Search completed: query={query!r}, results={len(offers)}, time={elapsed:.2f}s"
+                "Search completed: query=%r, results=%s, time=%.2fs", query, len(offers), elapsed
             )
 
             return offers
@@ -208,14 +295,31 @@ class BaseScraper(ABC):
         except Exception as e:
             elapsed = time.time() - start_time
             self.logger.error(
-                f"Search failed: query={query!r}, error={str(e)}, time={elapsed:.2f}s",
+                "Search failed: query=%r, error=%s, time=%.2fs",
+                query,
+                e,
+                elapsed,
                 exc_info=True,
             )
             # Graceful degradation - return empty list, never crash
             return []
 
+    def search_many(
+        self, queries: List[str], max_results: int = DEFAULT_MAX_RESULTS
+    ) -> Dict[str, List[Offer]]:
+        """
+        Search several queries. Duplicate queries are searched once.
+
+        The default runs search() for one query at a time; stores that can load several
+        queries together (e.g. pages on one browser context) override it.
+
+        Returns:
+            Offers keyed by query, in first-seen order
+        """
+        return {query: self.search(query, max_results) for query in dict.fromkeys(queries)}
+
     @abstractmethod
-    def _fetch_products(self, query: str) -> List[Offer]:
+    def _fetch_products(self, query: str, max_results: int = DEFAULT_MAX_RESULTS) -> List[Offer]:
         """
         Fetch products from the store's API/website.
 
@@ -224,6 +328,7 @@ class BaseScraper(ABC):
 
         Args:
             query: Search query string
+            max_results: Stop after this many products; search() truncates to it anyway
 
         Returns:
             List of Offer objects
@@ -239,19 +344,37 @@ class ScraperFactory:
     - Encapsulates scraper creation
     - Allows easy addition of new scrapers
     - Supports dependency injection for testing
+
+    Scrapers hold no per-query state, so one instance per store is created and reused.
     """
 
     _scrapers: dict = {}
+    _instances: dict = {}
+    _lock = threading.Lock()
 
     @classmethod
     def register(cls, store_name: str, scraper_class: type):
-        """Register a scraper class for a store"""
-        cls._scrapers[store_name.lower()] = scraper_class
+        """Register a scraper class for a store (replacing any cached instance)"""
+        key = store_name.lower()
+        with cls._lock:
+            registered = cls._scrapers.get(key)
+            if registered is scraper_class:
+                # e.g. a module imported twice; keep the cached instance
+                return
+            if registered is not None:
+                logger.warning(
+                    "Replacing scraper for %r: %s -> %s",
+                    key,
+                    registered.__name__,
+                    scraper_class.__name__,
+                )
+            cls._scrapers[key] = scraper_class
+            cls._instances.pop(key, None)
 
     @classmethod
     def create(cls, store_name: str) -> Optional[BaseScraper]:
         """
-        Create a scraper instance for the given store.
+        Get the scraper instance for the given store, creating it on first use.
 
         Args:
             store_name: Store name (case-insensitive)
@@ -259,10 +382,15 @@ class ScraperFactory:
         Returns:
             Scraper instance or None if store not found
         """
-        scraper_class = cls._scrapers.get(store_name.lower())
-        if scraper_class:
-            return scraper_class()
-        return None
+        key = store_name.lower()
+        with cls._lock:
+            scraper_class = cls._scrapers.get(key)
+            if scraper_class is None:
+                return None
+            instance = cls._instances.get(key)
+            if instance is None:
+                instance = cls._instances[key] = scraper_class()
+            return instance
 
     @classmethod
     def get_available_stores(cls) -> List[str]:
@@ -0,0 +1,150 @@
+"""
+Shared Playwright runtime for the browser-based scrapers.
+
+Launching Chromium costs far more than a single search, so one browser is started lazily
+and reused by every scraper and query; each search only opens its own context and page,
+or just a page on a long-lived per-store context from `get_context`.
+
+Playwright objects are bound to the event loop that created them, so the browser lives on
+one persistent event loop running in a daemon thread. The (synchronous) scrapers submit
+their search coroutines to it with `run_coroutine` instead of `asyncio.run`, which would
+create and tear down a loop - and a browser - per query.
+
+The same loop also owns a pooled `httpx.AsyncClient` (`get_http_client`) for scrapers
+that can call a store's JSON API directly instead of loading the page.
+"""
+
+import asyncio
+import atexit
+import concurrent.futures
+import logging
+import threading
+from typing import Any, Coroutine, Dict, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+try:
+    from playwright.async_api import async_playwright
+
+    PLAYWRIGHT_AVAILABLE = True
+except ImportError:
+    PLAYWRIGHT_AVAILABLE = False
+
+# Upper bound for one search submitted to the shared loop (navigation itself times out at 30s)
+DEFAULT_TIMEOUT_SECONDS = 60.0
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+# Only touched from coroutines running on `_loop`
+_playwright = None
+_browser = None
+_browser_lock: Optional[asyncio.Lock] = None
+_contexts: Dict[str, Any] = {}
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """Return the shared event loop, starting its thread on first use."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="playwright-loop", daemon=True).start()
+            _loop = loop
+        return _loop
+
+
+def run_coroutine(coro: Coroutine, timeout: Optional[float] = DEFAULT_TIMEOUT_SECONDS) -> Any:
+    """Run `coro` on the shared loop and block until it finishes (or `timeout` expires)."""
+    future = asyncio.run_coroutine_threadsafe(coro, _get_loop())
+    try:
+        return future.result(timeout)
+    except concurrent.futures.TimeoutError:
+        future.cancel()
+        raise
+
+
+def _get_browser_lock() -> asyncio.Lock:
+    global _browser_lock
+    if _browser_lock is None:
+        _browser_lock = asyncio.Lock()
+    return _browser_lock
+
+
+async def get_browser():
+    """Return the shared Chromium browser, launching it on first use or after a crash.
+
+    Must be awaited from a coroutine running on the shared loop (see `run_coroutine`).
+    """
+    global _playwright, _browser
+    async with _get_browser_lock():
+        if _browser is None or not _browser.is_connected():
+            if _playwright is None:
+                _playwright = await async_playwright().start()
+            _browser = await _playwright.chromium.launch(headless=True)
+            logger.info("Launched shared Chromium browser")
+    return _browser
+
+
+async def get_context(key: str, **options):
+    """Return the shared browser context for `key`, creating it with `options` on first use.
+
+    The context (and its cookies) is kept across queries; it is recreated if the browser
+    was relaunched. Must be awaited from a coroutine running on the shared loop.
+    """
+    browser = await get_browser()
+    async with _get_browser_lock():
+        context = _contexts.get(key)
+        if context is None or context.browser is not browser:
+            context = await browser.new_context(**options)
+            _contexts[key] = context
+    return context
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the pooled HTTP client, so keep-alive connections are reused across queries.
+
+    Must be called from a coroutine running on the shared loop.
+    """
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            timeout=10.0,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+        )
+    return _http_client
+
+
+async def _close_runtime() -> None:
+    global _playwright, _browser, _http_client
+    _contexts.clear()
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+    if _browser is not None:
+        await _browser.close()
+        _browser = None
+    if _playwright is not None:
+        await _playwright.stop()
+        _playwright = None
+
+
+def shutdown() -> None:
+    """Close the shared browser and HTTP client and stop the loop (runs at interpreter exit)."""
+    global _loop
+    with _loop_lock:
+        loop, _loop = _loop, None
+    if loop is None:
+        return
+    try:
+        asyncio.run_coroutine_threadsafe(_close_runtime(), loop).result(10)
+    except Exception as e:
+        logger.warning("Error closing shared browser: %s", e)
+    loop.call_soon_threadsafe(loop.stop)
+
+
+atexit.register(shutdown)
@@ -7,27 +7,43 @@ Implements BaseScraper interface for unified data acquisition layer.
 
 import asyncio
 import logging
+import os
 import re
-from typing import List, Optional
-
-from .base import BaseScraper, Offer, ScraperFactory, normalize_text, extract_brand
+from urllib.parse import parse_qsl, urlsplit, urlunsplit
+from typing import Dict, List, Optional, Tuple, Union
+
+from .base import (
+    DEFAULT_MAX_RESULTS,
+    BaseScraper,
+    Offer,
+    ScraperFactory,
+    build_fallback_index,
+    match_fallback,
+    normalize_text,
+    extract_brand,
+)
+from .browser import (
+    DEFAULT_TIMEOUT_SECONDS,
+    PLAYWRIGHT_AVAILABLE,
+    get_context,
+    get_http_client,
+    run_coroutine,
+)
 
 logger = logging.getLogger(__name__)
 
-try:
-    from playwright.async_api import async_playwright
-
-    PLAYWRIGHT_AVAILABLE = True
-except ImportError:
-    PLAYWRIGHT_AVAILABLE = False
+if not PLAYWRIGHT_AVAILABLE:
     logger.warning("Playwright not available - Carrefour live scraping disabled")
 
 
+_PRICE_RE = re.compile(r"(\d+[.,]\d+)")
+
+
 def _extract_price_from_text(text: str) -> Optional[float]:
     """Extract price from text."""
     if not text:
         return None
-    match = re.search(r"(\d+[.,]\d+)", str(text))
+    match = _PRICE_RE.search(text if isinstance(text, str) else str(text))
     if match:
         return float(match.group(1).replace(",", "."))
     return None
@@ -59,209 +75,333 @@ def _extract_price(product: dict) -> Optional[float]:
         return None
 
 
+# Pages a search_many batch keeps open at once on the shared Carrefour context
+CARREFOUR_BATCH_CONCURRENCY = max(1, int(os.getenv("CARREFOUR_BATCH_CONCURRENCY", "4")))
+# Upper bound for one query of a batch; a query that exceeds it falls back on its own
+CARREFOUR_QUERY_TIMEOUT_SECONDS = DEFAULT_TIMEOUT_SECONDS
+
+_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 Chrome/120.0.0.0 Safari/537.36"
+)
+
+# JSON search endpoint seen during a Playwright search: (url, params, query param name).
+# Once known, searches call it directly over HTTP instead of loading the page.
+_api_endpoint: Optional[Tuple[str, Dict[str, str], str]] = None
+
+
+def _products_from_response(data) -> List[dict]:
+    """Pull the product list out of a Carrefour search API response."""
+    if not isinstance(data, dict):
+        return []
+    # Try various response structures
+    return (
+        data.get("content", {}).get("docs", [])
+        or data.get("products", [])
+        or data.get("results", [])
+    )
+
+
+def _endpoint_template(url: str, query: str) -> Optional[Tuple[str, Dict[str, str], str]]:
+    """Turn an API URL into (url, params, query param name), if one param carries `query`."""
+    parts = urlsplit(url)
+    params = dict(parse_qsl(parts.query, keep_blank_values=True))
+    query_normalized = normalize_text(query)
+    for key, value in params.items():
+        if normalize_text(value) == query_normalized:
+            return urlunsplit(parts._replace(query="")), params, key
+    return None
+
+
+def _forget_endpoint(endpoint: Tuple[str, Dict[str, str], str]) -> None:
+    """Stop using a failing endpoint; the next Playwright search rediscovers it."""
+    global _api_endpoint
+    if _api_endpoint is endpoint:
+        _api_endpoint = None
+
+
+async def _fast_http_search(query: str, max_results: int = 20) -> Optional[List[dict]]:
+    """Search through the discovered JSON endpoint; None means use Playwright instead."""
+    endpoint = _api_endpoint
+    if endpoint is None:
+        return None
+    url, params, query_key = endpoint
+    try:
+        response = await get_http_client().get(
+            url,
+            params={**params, query_key: query},
+            headers={
+                "User-Agent": _USER_AGENT,
+                "Accept": "application/json",
+                "Accept-Language": "es-ES",
+            },
+        )
+        if response.status_code != 200:
+            logger.info("Carrefour API returned %s, using Playwright", response.status_code)
+            _forget_endpoint(endpoint)
+            return None
+        products = _products_from_response(response.json())
+    except Exception as e:
+        logger.info("Carrefour API error, using Playwright: %s", e)
+        _forget_endpoint(endpoint)
+        return None
+    return products[:max_results] or None
+
+
+async def _search_carrefour(query: str, max_results: int = 20) -> List[dict]:
+    """Search over plain HTTP when the JSON API is known, otherwise with Playwright."""
+    products = await _fast_http_search(query, max_results)
+    if products:
+        return products
+    return await _search_carrefour_playwright(query, max_results)
+
+
 async def _search_carrefour_playwright(query: str, max_results: int = 20) -> List[dict]:
     """Search Carrefour using Playwright with API interception."""
+    global _api_endpoint
     if not PLAYWRIGHT_AVAILABLE:
         return []
 
     products = []
     api_responses = []
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        context = await browser.new_context(
-            user_agent=(
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 Chrome/120.0.0.0 Safari/537.36"
-            ),
-            locale="es-ES",
-        )
+    context = await get_context("carrefour", user_agent=_USER_AGENT, locale="es-ES")
 
-        page = await context.new_page()
+    page = await context.new_page()
 
-        # Intercept API responses
-        async def handle_response(response):
-            url = response.url
-            if "search" in url and ("api" in url or "query" in url):
-                try:
-                    if "application/json" in response.headers.get("content-type", ""):
-                        data = await response.json()
-                        api_responses.append(data)
-                except Exception:
-                    pass
+    # Intercept API responses
+    async def handle_response(response):
+        url = response.url
+        if "search" in url and ("api" in url or "query" in url):
+            try:
+                if "application/json" in response.headers.get("content-type", ""):
+                    data = await response.json()
+                    api_responses.append((url, data))
+            except Exception:
+                pass
 
-        page.on("response", handle_response)
+    page.on("response", handle_response)
 
-        try:
-            search_url = f"https://www.carrefour.es/search?query={query}"
-            await page.goto(search_url, wait_until="networkidle", timeout=30000)
+    try:
+        search_url = f"https://www.carrefour.es/search?query={query}"
+        await page.goto(search_url, wait_until="networkidle", timeout=30000)
+        # networkidle already covers the search requests; only linger (for late responses
+        # or the DOM fallback) when nothing has been captured yet
+        if not api_responses:
             await page.wait_for_timeout(2000)
 
-            # Parse API responses
-            for data in api_responses:
-                if isinstance(data, dict):
-                    # Try various response structures
-                    prods = (
-                        data.get("content", {}).get("docs", [])
-                        or data.get("products", [])
-                        or data.get("results", [])
-                    )
-                    products.extend(prods)
-
-            # If no API data, try DOM extraction
-            if not products:
-                products = await _extract_from_dom(page, max_results)
+        # Parse API responses
+        for url, data in api_responses:
+            prods = _products_from_response(data)
+            if prods and _api_endpoint is None:
+                _api_endpoint = _endpoint_template(url, query)
+                if _api_endpoint:
+                    logger.info("Discovered Carrefour search API: %s", _api_endpoint[0])
+            products.extend(prods)
 
-        except Exception as e:
-            logger.warning(f"Playwright Carrefour error: {e}")
-        finally:
-            await browser.close()
+        # If no API data, try DOM extraction
+        if not products:
+            products = await _extract_from_dom(page, max_results)
+
+    except Exception as e:
+        logger.warning("Playwright Carrefour error: %s", e)
+    finally:
+        await page.close()
 
     return products[:max_results]
 
 
+async def _search_carrefour_playwright_batch(
+    queries: List[str], max_results: int = 20
+) -> List[Union[List[dict], BaseException]]:
+    """Run several searches concurrently on the shared loop (pages share one context).
+
+    At most CARREFOUR_BATCH_CONCURRENCY pages are open at once, and each query gets its
+    own timeout (counted once it holds a slot); failures are returned, not raised.
+    """
+    semaphore = asyncio.Semaphore(CARREFOUR_BATCH_CONCURRENCY)
+
+    async def search_one(query: str) -> List[dict]:
+        async with semaphore:
+            return await asyncio.wait_for(
+                _search_carrefour(query, max_results), CARREFOUR_QUERY_TIMEOUT_SECONDS
+            )
+
+    return await asyncio.gather(*(search_one(query) for query in queries), return_exceptions=True)
+
+
+# Title and price text of one product card, read in a single round-trip to the page
+_DOM_FIELDS_JS = """el => {
+    const text = (selector) => el.querySelector(selector)?.textContent || "";
+    return [text('[class*="title"], h2, h3'), text('[class*="price"]')];
+}"""
+
+
+async def _extract_dom_item(item) -> Optional[dict]:
+    """Extract one product card, or None if it has no usable name and price."""
+    try:
+        name, price_text = await item.evaluate(_DOM_FIELDS_JS)
+    except Exception:
+        return None
+    if name and price_text:
+        price = _extract_price_from_text(price_text)
+        if price and price > 0:
+            return {"name": name.strip(), "price": price}
+    return None
+
+
 async def _extract_from_dom(page, max_results: int) -> List[dict]:
-    """Extract products from DOM as fallback."""
-    products = []
+    """Extract products from DOM as fallback (all cards are read concurrently)."""
     try:
         items = await page.query_selector_all(
             "[data-productid], .product-card, .product-card-list__item"
         )
-        for item in items[:max_results]:
-            try:
-                name = (
-                    await item.eval_on_selector('[class*="title"], h2, h3', "el => el.textContent")
-                    or ""
-                )
-                price_text = (
-                    await item.eval_on_selector('[class*="price"]', "el => el.textContent") or ""
-                )
-                if name and price_text:
-                    price = _extract_price_from_text(price_text)
-                    if price and price > 0:
-                        products.append({"name": name.strip(), "price": price})
-            except Exception:
-                continue
+        extracted = await asyncio.gather(*(_extract_dom_item(item) for item in items[:max_results]))
     except Exception:
-        pass
-    return products
+        return []
+    return [product for product in extracted if product]
+
+
+_FALLBACK_DATA = {
+    "leche": [
+        ("Leche entera Carrefour 1L", 0.89, "Carrefour"),
+        ("Leche semidesnatada Carrefour 1L", 0.85, "Carrefour"),
+        ("Leche desnatada Pascual 1L", 1.19, "Pascual"),
+        ("Leche sin lactosa Central Lechera 1L", 1.39, "Central Lechera"),
+    ],
+    "huevos": [
+        ("Huevos frescos M Carrefour docena", 2.49, "Carrefour"),
+        ("Huevos camperos L 6 unidades", 2.89, "Carrefour"),
+    ],
+    "pan": [
+        ("Pan de molde integral Carrefour 450g", 1.29, "Carrefour"),
+        ("Pan Bimbo familiar 700g", 2.39, "Bimbo"),
+    ],
+    "arroz": [("Arroz largo Carrefour 1kg", 1.39, "Carrefour")],
+    "aceite": [("Aceite oliva virgen extra Carrefour 1L", 7.29, "Carrefour")],
+    "yogur": [("Yogur natural Carrefour pack 4", 1.19, "Carrefour")],
+    "pasta": [("Espaguetis Carrefour 500g", 0.85, "Carrefour")],
+    "pollo": [("Pechuga pollo fileteada 500g", 5.25, None)],
+    "tomate": [("Tomate frito Carrefour 400g", 0.95, "Carrefour")],
+    "agua": [("Agua mineral Carrefour 6x1.5L", 1.69, "Carrefour")],
+}
+
+_FALLBACK_INDEX = build_fallback_index(_FALLBACK_DATA)
 
 
 class CarrefourScraper(BaseScraper):
     """Carrefour Spain scraper using Playwright."""
 
     STORE_NAME = "Carrefour"
+    NORMALIZES_OWN_NAMES = True
     BASE_URL = "https://www.carrefour.es"
 
-    def _fetch_products(self, query: str) -> List[Offer]:
-        self.logger.info(f"Searching Carrefour for: {query}")
+    def _fetch_products(self, query: str, max_results: int = DEFAULT_MAX_RESULTS) -> List[Offer]:
+        self.logger.info("Searching Carrefour for: %s", query)
 
         if not PLAYWRIGHT_AVAILABLE:
-            return self._fallback_search(query)
+            return self._fallback_search(query, max_results)
 
         try:
-            products = asyncio.run(_search_carrefour_playwright(query))
-
-            if products:
-                offers = []
-                for product in products:
-                    name = product.get("display_name") or product.get("name") or ""
-                    if not name:
-                        continue
-
-                    price = _extract_price(product)
-                    if not price or price <= 0:
-                        price = product.get("price")
-                        if isinstance(price, str):
-                            price = _extract_price_from_text(price)
-                    if not price or price <= 0:
-                        continue
-
-                    offers.append(
-                        Offer(
-                            store=self.STORE_NAME,
-                            name=name,
-                            brand=product.get("brand") or extract_brand(name),
-                            price=float(price),
-                            url=product.get("url") or f"{self.BASE_URL}/search?query={query}",
-                            image_url=product.get("image_path") or product.get("image"),
-                            normalized_name=normalize_text(name),
-                        )
-                    )
-
-                if offers:
-                    self.logger.info(f"Carrefour returned {len(offers)} live products")
-                    return offers
-
-            return self._fallback_search(query)
+            products = run_coroutine(_search_carrefour(query, max_results))
+            offers = self._to_offers(products, query)
+            if offers:
+                self.logger.info("Carrefour returned %s live products", len(offers))
+                return offers
+
+            return self._fallback_search(query, max_results)
 
         except Exception as e:
-            self.logger.warning(f"Carrefour error: {e}")
-            return self._fallback_search(query)
+            self.logger.warning("Carrefour error: %s", e)
+            return self._fallback_search(query, max_results)
+
+    def search_many(
+        self, queries: List[str], max_results: int = DEFAULT_MAX_RESULTS
+    ) -> Dict[str, List[Offer]]:
+        """
+        Search several queries in one round-trip to the shared browser.
+
+        The queries' pages load concurrently on the Carrefour context, a few at a time
+        and each under its own timeout; each query falls back to mock data on its own.
+        Duplicate queries are searched once.
+
+        Returns:
+            Offers keyed by query, in first-seen order
+        """
+        unique = list(dict.fromkeys(queries))
+        if not PLAYWRIGHT_AVAILABLE:
+            return {query: self.search(query, max_results) for query in unique}
 
-    def _fallback_search(self, query: str) -> List[Offer]:
-        """Fallback with realistic mock data."""
-        self.logger.info("Using Carrefour fallback data")
-        fallback_data = {
-            "leche": [
-                ("Leche entera Carrefour 1L", 0.89, "Carrefour"),
-                ("Leche semidesnatada Carrefour 1L", 0.85, "Carrefour"),
-                ("Leche desnatada Pascual 1L", 1.19, "Pascual"),
-                ("Leche sin lactosa Central Lechera 1L", 1.39, "Central Lechera"),
-            ],
-            "huevos": [
-                ("Huevos frescos M Carrefour docena", 2.49, "Carrefour"),
-                ("Huevos camperos L 6 unidades", 2.89, "Carrefour"),
-            ],
-            "pan": [
-                ("Pan de molde integral Carrefour 450g", 1.29, "Carrefour"),
-                ("Pan Bimbo familiar 700g", 2.39, "Bimbo"),
-            ],
-            "arroz": [("Arroz largo Carrefour 1kg", 1.39, "Carrefour")],
-            "aceite": [("Aceite oliva virgen extra Carrefour 1L", 7.29, "Carrefour")],
-            "yogur": [("Yogur natural Carrefour pack 4", 1.19, "Carrefour")],
-            "pasta": [("Espaguetis Carrefour 500g", 0.85, "Carrefour")],
-            "pollo": [("Pechuga pollo fileteada 500g", 5.25, None)],
-            "tomate": [("Tomate frito Carrefour 400g", 0.95, "Carrefour")],
-            "agua": [("Agua mineral Carrefour 6x1.5L", 1.69, "Carrefour")],
-        }
-
-        query_lower = normalize_text(query)
+        self.logger.info("Searching Carrefour for %s queries in one batch", len(unique))
+        try:
+            # Every query is bounded by its own timeout, so the batch as a whole is not
+            batches = run_coroutine(
+                _search_carrefour_playwright_batch(unique, max_results), timeout=None
+            )
+        except Exception as e:
+            self.logger.warning("Carrefour batch error: %s", e)
+            batches = [[] for _ in unique]
+
+        results = {}
+        for query, products in zip(unique, batches):
+            if isinstance(products, BaseException):
+                self.logger.warning("Carrefour error for %r: %s", query, products)
+                products = []
+            results[query] = self._to_offers(products, query) or self._fallback_search(
+                query, max_results
+            )
+        return results
+
+    def _to_offers(self, products: List[dict], query: str) -> List[Offer]:
+        """Convert raw Carrefour products into Offers, skipping unnamed or unpriced ones."""
         offers = []
+        for product in products:
+            name = product.get("display_name") or product.get("name") or ""
+            if not name:
+                continue
+
+            price = _extract_price(product)
+            if not price or price <= 0:
+                price = product.get("price")
+                if isinstance(price, str):
+                    price = _extract_price_from_text(price)
+            if not price or price <= 0:
+                continue
 
-        for category, products in fallback_data.items():
-            if query_lower in category or category in query_lower:
-                for name, price, brand in products:
-                    offers.append(
-                        Offer(
-                            store=self.STORE_NAME,
-                            name=name,
-                            brand=brand,
-                            price=price,
-                            url=f"{self.BASE_URL}/search?query={query}",
-                            normalized_name=normalize_text(name),
-                        )
-                    )
-
-        if not offers:
-            for category, products in fallback_data.items():
-                for name, price, brand in products:
-                    if query_lower in normalize_text(name):
-                        offers.append(
-                            Offer(
-                                store=self.STORE_NAME,
-                                name=name,
-                                brand=brand,
-                                price=price,
-                                url=f"{self.BASE_URL}/search?query={query}",
-                                normalized_name=normalize_text(name),
-                            )
-                        )
+            name_normalized = normalize_text(name)
+            offers.append(
+                Offer(
+                    store=self.STORE_NAME,
+                    name=name,
+                    brand=product.get("brand") or extract_brand(name, name_normalized),
+                    price=float(price),
+                    url=product.get("url") or f"{self.BASE_URL}/search?query={query}",
+                    image_url=product.get("image_path") or product.get("image"),
+                    normalized_name=name_normalized,
+                )
+            )
         return offers
 
+    def _fallback_search(self, query: str, max_results: int = DEFAULT_MAX_RESULTS) -> List[Offer]:
+        """Fallback with realistic mock data."""
+        self.logger.info("Using Carrefour fallback data")
+        matches = match_fallback(_FALLBACK_INDEX, normalize_text(query))[:max_results]
+        url = f"{self.BASE_URL}/search?query={query}"
+        # Static data, valid by construction: skip per-field validation
+        return [
+            Offer.model_construct(
+                store=self.STORE_NAME,
+                name=name,
+                brand=brand,
+                price=price,
+                url=url,
+                normalized_name=name_normalized,
+            )
+            for name, name_normalized, price, brand in matches
+        ]
+
 
 ScraperFactory.register("carrefour", CarrefourScraper)
 
 
 def scrape_carrefour(query: str) -> List[Offer]:
-    return CarrefourScraper().search(query)
+    return ScraperFactory.create("carrefour").search(query)
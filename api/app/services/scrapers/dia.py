@@ -5,28 +5,35 @@ Uses Playwright to intercept API responses for reliable data extraction.
 Implements BaseScraper interface for unified data acquisition layer.
 """
 
-import asyncio
 import logging
 import re
 from typing import List, Optional
 
-from .base import BaseScraper, Offer, ScraperFactory, normalize_text, extract_brand
+from .base import (
+    DEFAULT_MAX_RESULTS,
+    BaseScraper,
+    Offer,
+    ScraperFactory,
+    build_fallback_index,
+    match_fallback,
+    normalize_text,
+    extract_brand,
+)
+from .browser import PLAYWRIGHT_AVAILABLE, get_browser, run_coroutine
 
 logger = logging.getLogger(__name__)
 
-try:
-    from playwright.async_api import async_playwright
-
-    PLAYWRIGHT_AVAILABLE = True
-except ImportError:
-    PLAYWRIGHT_AVAILABLE = False
+if not PLAYWRIGHT_AVAILABLE:
     logger.warning("Playwright not available - Dia live scraping disabled")
 
 
+_PRICE_RE = re.compile(r"(\d+[.,]\d+)")
+
+
 def _extract_price_from_text(text: str) -> Optional[float]:
     if not text:
         return None
-    match = re.search(r"(\d+[.,]\d+)", str(text))
+    match = _PRICE_RE.search(text if isinstance(text, str) else str(text))
     if match:
         return float(match.group(1).replace(",", "."))
     return None
@@ -62,64 +69,87 @@ async def _search_dia_playwright(query: str, max_results: int = 20) -> List[dict
     products = []
     api_responses = []
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        context = await browser.new_context(
-            user_agent=(
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 Chrome/120.0.0.0 Safari/537.36"
-            ),
-            locale="es-ES",
-        )
-        page = await context.new_page()
-
-        async def handle_response(response):
-            url = response.url
-            if ("search" in url or "product" in url) and "api" in url:
-                try:
-                    if "application/json" in response.headers.get("content-type", ""):
-                        data = await response.json()
-                        api_responses.append(data)
-                except Exception:
-                    pass
+    browser = await get_browser()
+    context = await browser.new_context(
+        user_agent=(
+            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+            "AppleWebKit/537.36 Chrome/120.0.0.0 Safari/537.36"
+        ),
+        locale="es-ES",
+    )
+    page = await context.new_page()
+
+    async def handle_response(response):
+        url = response.url
+        if ("search" in url or "product" in url) and "api" in url:
+            try:
+                if "application/json" in response.headers.get("content-type", ""):
+                    data = await response.json()
+                    api_responses.append(data)
+            except Exception:
+                pass
+
+    page.on("response", handle_response)
 
-        page.on("response", handle_response)
+    try:
+        await page.goto(
+            f"https://www.dia.es/search?q={query}", wait_until="networkidle", timeout=30000
+        )
+        await page.wait_for_timeout(2000)
+
+        for data in api_responses:
+            if isinstance(data, dict):
+                prods = (
+                    data.get("products", [])
+                    or data.get("search_items", [])
+                    or data.get("results", [])
+                )
+                products.extend(prods)
+
+    except Exception as e:
+        logger.warning("Playwright Dia error: %s", e)
+    finally:
+        await context.close()
 
-        try:
-            await page.goto(
-                f"https://www.dia.es/search?q={query}", wait_until="networkidle", timeout=30000
-            )
-            await page.wait_for_timeout(2000)
-
-            for data in api_responses:
-                if isinstance(data, dict):
-                    prods = (
-                        data.get("products", [])
-                        or data.get("search_items", [])
-                        or data.get("results", [])
-                    )
-                    products.extend(prods)
+    return products[:max_results]
 
-        except Exception as e:
-            logger.warning(f"Playwright Dia error: {e}")
-        finally:
-            await browser.close()
 
-    return products[:max_results]
+_FALLBACK_DATA = {
+    "leche": [
+        ("Leche entera Dia 1L", 0.75, "Dia"),
+        ("Leche semidesnatada Dia 1L", 0.72, "Dia"),
+        ("Leche sin lactosa Dia 1L", 1.09, "Dia"),
+        ("Leche Puleva 1L", 1.19, "Puleva"),
+    ],
+    "huevos": [("Huevos frescos M Dia docena", 2.19, "Dia")],
+    "pan": [("Pan de molde Dia 450g", 0.89, "Dia")],
+    "arroz": [("Arroz redondo Dia 1kg", 1.05, "Dia")],
+    "aceite": [("Aceite oliva virgen extra Dia 1L", 5.99, "Dia")],
+    "yogur": [("Yogur natural Dia pack 4", 0.89, "Dia")],
+    "pasta": [("Espaguetis Dia 500g", 0.59, "Dia")],
+    "pollo": [("Pechuga pollo fileteada 500g", 4.29, None)],
+    "tomate": [("Tomate frito Dia 400g", 0.69, "Dia")],
+    "agua": [("Agua mineral Dia 6x1.5L", 1.55, "Dia")],
+    "cafe": [("Café molido Dia 250g", 1.95, "Dia")],
+    "cerveza": [("Cerveza Dia pack 6", 2.19, "Dia")],
+}
+
+_FALLBACK_INDEX = build_fallback_index(_FALLBACK_DATA)
 
 
 class DiaScraper(BaseScraper):
     STORE_NAME = "Dia"
+    NORMALIZES_OWN_NAMES = True
     BASE_URL = "https://www.dia.es"
 
-    def _fetch_products(self, query: str) -> List[Offer]:
-        self.logger.info(f"Searching Dia for: {query}")
+    def _fetch_products(self, query: str, max_results: int = DEFAULT_MAX_RESULTS) -> List[Offer]:
+        self.logger.info("Searching Dia for: %s", query)
 
         if not PLAYWRIGHT_AVAILABLE:
-            return self._fallback_search(query)
+            return self._fallback_search(query, max_results)
 
         try:
-            products = asyncio.run(_search_dia_playwright(query))
+            products = run_coroutine(_search_dia_playwright(query, max_results))
 
             if products:
                 offers = []
@@ -137,86 +167,49 @@ class DiaScraper(BaseScraper):
                     if not price or price <= 0:
                         continue
 
+                    name_normalized = normalize_text(name)
                     offers.append(
                         Offer(
                             store=self.STORE_NAME,
                             name=name,
-                            brand=product.get("brand") or extract_brand(name),
+                            brand=product.get("brand") or extract_brand(name, name_normalized),
                             price=float(price),
                             url=product.get("url") or f"{self.BASE_URL}/search?q={query}",
                             image_url=product.get("image"),
-                            normalized_name=normalize_text(name),
+                            normalized_name=name_normalized,
                         )
                     )
 
                 if offers:
-                    self.logger.info(f"Dia returned {len(offers)} live products")
+                    self.logger.info("Dia returned %s live products", len(offers))
                     return offers
 
-            return self._fallback_search(query)
+            return self._fallback_search(query, max_results)
 
         except Exception as e:
-            self.logger.warning(f"Dia error: {e}")
-            return self._fallback_search(query)
+            self.logger.warning("Dia error: %s", e)
+            return self._fallback_search(query, max_results)
 
-    def _fallback_search(self, query: str) -> List[Offer]:
+    def _fallback_search(self, query: str, max_results: int = DEFAULT_MAX_RESULTS) -> List[Offer]:
         self.logger.info("Using Dia fallback data")
-        fallback_data = {
-            "leche": [
-                ("Leche entera Dia 1L", 0.75, "Dia"),
-                ("Leche semidesnatada Dia 1L", 0.72, "Dia"),
-                ("Leche sin lactosa Dia 1L", 1.09, "Dia"),
-                ("Leche Puleva 1L", 1.19, "Puleva"),
-            ],
-            "huevos": [("Huevos frescos M Dia docena", 2.19, "Dia")],
-            "pan": [("Pan de molde Dia 450g", 0.89, "Dia")],
-            "arroz": [("Arroz redondo Dia 1kg", 1.05, "Dia")],
-            "aceite": [("Aceite oliva virgen extra Dia 1L", 5.99, "Dia")],
-            "yogur": [("Yogur natural Dia pack 4", 0.89, "Dia")],
-            "pasta": [("Espaguetis Dia 500g", 0.59, "Dia")],
-            "pollo": [("Pechuga pollo fileteada 500g", 4.29, None)],
-            "tomate": [("Tomate frito Dia 400g", 0.69, "Dia")],
-            "agua": [("Agua mineral Dia 6x1.5L", 1.55, "Dia")],
-            "cafe": [("Café molido Dia 250g", 1.95, "Dia")],
-            "cerveza": [("Cerveza Dia pack 6", 2.19, "Dia")],
-        }
-
-        query_lower = normalize_text(query)
-        offers = []
-
-        for category, products in fallback_data.items():
-            if query_lower in category or category in query_lower:
-                for name, price, brand in products:
-                    offers.append(
-                        Offer(
-                            store=self.STORE_NAME,
-                            name=name,
-                            brand=brand,
-                            price=price,
-                            url=f"{self.BASE_URL}/search?q={query}",
-                            normalized_name=normalize_text(name),
-                        )
-                    )
-
-        if not offers:
-            for category, products in fallback_data.items():
-                for name, price, brand in products:
-                    if query_lower in normalize_text(name):
-                        offers.append(
-                            Offer(
-                                store=self.STORE_NAME,
-                                name=name,
-                                brand=brand,
-                                price=price,
-                                url=f"{self.BASE_URL}/search?q={query}",
-                                normalized_name=normalize_text(name),
-                            )
-                        )
-        return offers
+        matches = match_fallback(_FALLBACK_INDEX, normalize_text(query))[:max_results]
+        url = f"{self.BASE_URL}/search?q={query}"
+        # Static data, valid by construction: skip per-field validation
+        return [
+            Offer.model_construct(
+                store=self.STORE_NAME,
+                name=name,
+                brand=brand,
+                price=price,
+                url=url,
+                normalized_name=name_normalized,
+            )
+            for name, name_normalized, price, brand in matches
+        ]
 
 
 ScraperFactory.register("dia", DiaScraper)
 
 
 def scrape_dia(query: str) -> List[Offer]:
-    return DiaScraper().search(query)
+    return ScraperFactory.create("dia").search(query)
@@ -5,30 +5,37 @@ Uses Playwright to intercept API responses for reliable data extraction.
 Implements BaseScraper interface for unified data acquisition layer.
 """
 
-import asyncio
 import logging
 import re
 from typing import List, Optional
 
-from .base import BaseScraper, Offer, ScraperFactory, normalize_text, extract_brand
+from .base import (
+    DEFAULT_MAX_RESULTS,
+    BaseScraper,
+    Offer,
+    ScraperFactory,
+    build_fallback_index,
+    match_fallback,
+    normalize_text,
+    extract_brand,
+)
+from .browser import PLAYWRIGHT_AVAILABLE, get_browser, run_coroutine
 
 logger = logging.getLogger(__name__)
 
-try:
-    from playwright.async_api import async_playwright
-
-    PLAYWRIGHT_AVAILABLE = True
-except ImportError:
-    PLAYWRIGHT_AVAILABLE = False
+if not PLAYWRIGHT_AVAILABLE:
     logger.warning("Playwright not available - Lidl live scraping disabled")
 
 LIDL_BRANDS = ["milbona", "deluxe", "cien", "silvercrest", "parkside", "combino", "snack day"]
 
 
+_PRICE_RE = re.compile(r"(\d+[.,]\d+)")
+
+
 def _extract_price_from_text(text: str) -> Optional[float]:
     if not text:
         return None
-    match = re.search(r"(\d+[.,]\d+)", str(text))
+    match = _PRICE_RE.search(text if isinstance(text, str) else str(text))
     if match:
         return float(match.group(1).replace(",", "."))
     return None
@@ -51,12 +58,12 @@ def _extract_price(product: dict) -> Optional[float]:
         return None
 
 
-def _extract_lidl_brand(name: str) -> Optional[str]:
-    name_lower = name.lower()
+def _extract_lidl_brand(name: str, normalized_name: Optional[str] = None) -> Optional[str]:
+    name_normalized = normalized_name or normalize_text(name)
     for brand in LIDL_BRANDS:
-        if brand in name_lower:
+        if brand in name_normalized:
             return brand.title()
-    return extract_brand(name)
+    return extract_brand(name, name_normalized)
 
 
 async def _search_lidl_playwright(query: str, max_results: int = 20) -> List[dict]:
@@ -66,62 +73,81 @@ async def _search_lidl_playwright(query: str, max_results: int = 20) -> List[dic
     products = []
     api_responses = []
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        context = await browser.new_context(
-            user_agent=(
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 Chrome/120.0.0.0 Safari/537.36"
-            ),
-            locale="es-ES",
+    browser = await get_browser()
+    context = await browser.new_context(
+        user_agent=(
+            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+            "AppleWebKit/537.36 Chrome/120.0.0.0 Safari/537.36"
+        ),
+        locale="es-ES",
+    )
+    page = await context.new_page()
+
+    async def handle_response(response):
+        url = response.url
+        if "search" in url and "api" in url:
+            try:
+                if "application/json" in response.headers.get("content-type", ""):
+                    data = await response.json()
+                    api_responses.append(data)
+            except Exception:
+                pass
+
+    page.on("response", handle_response)
+
+    try:
+        await page.goto(
+            f"https://www.lidl.es/q/query/?q={query}", wait_until="networkidle", timeout=30000
         )
-        page = await context.new_page()
+        await page.wait_for_timeout(2000)
 
-        async def handle_response(response):
-            url = response.url
-            if "search" in url and "api" in url:
-                try:
-                    if "application/json" in response.headers.get("content-type", ""):
-                        data = await response.json()
-                        api_responses.append(data)
-                except Exception:
-                    pass
+        for data in api_responses:
+            if isinstance(data, dict):
+                prods = data.get("products", []) or data.get("results", []) or data.get("hits", [])
+                products.extend(prods)
 
-        page.on("response", handle_response)
+    except Exception as e:
+        logger.warning("Playwright Lidl error: %s", e)
+    finally:
+        await context.close()
 
-        try:
-            await page.goto(
-                f"https://www.lidl.es/q/query/?q={query}", wait_until="networkidle", timeout=30000
-            )
-            await page.wait_for_timeout(2000)
+    return products[:max_results]
 
-            for data in api_responses:
-                if isinstance(data, dict):
-                    prods = (
-                        data.get("products", []) or data.get("results", []) or data.get("hits", [])
-                    )
-                    products.extend(prods)
 
-        except Exception as e:
-            logger.warning(f"Playwright Lidl error: {e}")
-        finally:
-            await browser.close()
+_FALLBACK_DATA = {
+    "leche": [
+        ("Leche entera Milbona 1L", 0.79, "Milbona"),
+        ("Leche semidesnatada Milbona 1L", 0.75, "Milbona"),
+        ("Leche sin lactosa Milbona 1L", 1.15, "Milbona"),
+    ],
+    "huevos": [("Huevos frescos M 12 unidades", 2.25, "Lidl")],
+    "pan": [("Pan de molde integral 450g", 0.95, "Lidl")],
+    "arroz": [("Arroz redondo 1kg", 1.15, "Lidl")],
+    "aceite": [("Aceite oliva virgen extra 1L", 6.29, "Lidl")],
+    "yogur": [("Yogur natural Milbona pack 4", 0.95, "Milbona")],
+    "pasta": [("Espaguetis Combino 500g", 0.65, "Combino")],
+    "pollo": [("Pechuga pollo fileteada 500g", 4.45, None)],
+    "tomate": [("Tomate frito 400g", 0.75, "Lidl")],
+    "agua": [("Agua mineral 6x1.5L", 1.45, "Lidl")],
+    "cerveza": [("Cerveza Perlenbacher pack 6", 2.39, "Perlenbacher")],
+}
 
-    return products[:max_results]
+_FALLBACK_INDEX = build_fallback_index(_FALLBACK_DATA)
 
 
 class LidlScraper(BaseScraper):
     STORE_NAME = "Lidl"
+    NORMALIZES_OWN_NAMES = True
     BASE_URL = "https://www.lidl.es"
 
-    def _fetch_products(self, query: str) -> List[Offer]:
-        self.logger.info(f"Searching Lidl for: {query}")
+    def _fetch_products(self, query: str, max_results: int = DEFAULT_MAX_RESULTS) -> List[Offer]:
+        self.logger.info("Searching Lidl for: %s", query)
 
         if not PLAYWRIGHT_AVAILABLE:
-            return self._fallback_search(query)
+            return self._fallback_search(query, max_results)
 
         try:
-            products = asyncio.run(_search_lidl_playwright(query))
+            products = run_coroutine(_search_lidl_playwright(query, max_results))
 
             if products:
                 offers = []
@@ -140,85 +166,52 @@ class LidlScraper(BaseScraper):
                     if not price or price <= 0:
                         continue
 
+                    name_normalized = normalize_text(name)
                     offers.append(
                         Offer(
                             store=self.STORE_NAME,
                             name=name,
-                            brand=product.get("brand") or _extract_lidl_brand(name),
+                            brand=(
+                                product.get("brand") or _extract_lidl_brand(name, name_normalized)
+                            ),
                             price=float(price),
                             url=product.get("canonicalUrl")
                             or f"{self.BASE_URL}/q/query/?q={query}",
                             image_url=product.get("image"),
-                            normalized_name=normalize_text(name),
+                            normalized_name=name_normalized,
                         )
                     )
 
                 if offers:
-                    self.logger.info(f"Lidl returned {len(offers)} live products")
+                    self.logger.info("Lidl returned %s live products", len(offers))
                     return offers
 
-            return self._fallback_search(query)
+            return self._fallback_search(query, max_results)
 
         except Exception as e:
-            self.logger.warning(f"Lidl error: {e}")
-            return self._fallback_search(query)
+            self.logger.warning("Lidl error: %s", e)
+            return self._fallback_search(query, max_results)
 
-    def _fallback_search(self, query: str) -> List[Offer]:
+    def _fallback_search(self, query: str, max_results: int = DEFAULT_MAX_RESULTS) -> List[Offer]:
         self.logger.info("Using Lidl fallback data")
-        fallback_data = {
-            "leche": [
-                ("Leche entera Milbona 1L", 0.79, "Milbona"),
-                ("Leche semidesnatada Milbona 1L", 0.75, "Milbona"),
-                ("Leche sin lactosa Milbona 1L", 1.15, "Milbona"),
-            ],
-            "huevos": [("Huevos frescos M 12 unidades", 2.25, "Lidl")],
-            "pan": [("Pan de molde integral 450g", 0.95, "Lidl")],
-            "arroz": [("Arroz redondo 1kg", 1.15, "Lidl")],
-            "aceite": [("Aceite oliva virgen extra 1L", 6.29, "Lidl")],
-            "yogur": [("Yogur natural Milbona pack 4", 0.95, "Milbona")],
-            "pasta": [("Espaguetis Combino 500g", 0.65, "Combino")],
-            "pollo": [("Pechuga pollo fileteada 500g", 4.45, None)],
-            "tomate": [("Tomate frito 400g", 0.75, "Lidl")],
-            "agua": [("Agua mineral 6x1.5L", 1.45, "Lidl")],
-            "cerveza": [("Cerveza Perlenbacher pack 6", 2.39, "Perlenbacher")],
-        }
-
-        query_lower = normalize_text(query)
-        offers = []
-
-        for category, products in fallback_data.items():
-            if query_lower in category or category in query_lower:
-                for name, price, brand in products:
-                    offers.append(
-                        Offer(
-                            store=self.STORE_NAME,
-                            name=name,
-                            brand=brand,
-                            price=price,
-                            url=f"{self.BASE_URL}/q/query/?q={query}",
-                            normalized_name=normalize_text(name),
-                        )
-                    )
-
-        if not offers:
-            for category, products in fallback_data.items():
-                for name, price, brand in products:
-                    if query_lower in normalize_text(name):
-                        offers.append(
-                            Offer(
-                                store=self.STORE_NAME,
-                                name=name,
-                                brand=brand,
-                                price=price,
-                                url=f"{self.BASE_URL}/q/query/?q={query}",
-                                normalized_name=normalize_text(name),
-                            )
-                        )
-        return offers
+        matches = match_fallback(_FALLBACK_INDEX, normalize_text(query))[:max_results]
+        url = f"{self.BASE_URL}/q/query/?q={query}"
+        # Static data, valid by construction: skip per-field validation
+        return [
+            Offer.model_construct(
+                store=self.STORE_NAME,
+                name=name,
+                brand=brand,
+                price=price,
+                url=url,
+                normalized_name=name_normalized,
+            )
+            for name, name_normalized, price, brand in matches
+        ]
 
 
 ScraperFactory.register("lidl", LidlScraper)
 
 
 def scrape_lidl(query: str) -> List[Offer]:
-    return LidlScraper().search(query)
+    return ScraperFactory.create("lidl").search(query)
@@ -19,6 +19,7 @@ Why this is best practice:
 - Adding new supermarkets requires no refactoring outside Team A
 """
 
+import asyncio
 import logging
 import time
 from typing import List, Dict, Optional
@@ -98,7 +99,7 @@ class ScraperManager:
         """
         start_time = time.time()
         self.logger.info(
-            f"ScraperManager: Starting search for '{query}' across {len(self.scrapers)} stores"
+            "ScraperManager: Starting search for '%s' across %s stores", query, len(self.scrapers)
         )
 
         all_offers: List[Offer] = []
@@ -115,29 +116,117 @@ class ScraperManager:
                 all_offers.extend(offers)
                 store_results[store_name] = len(offers)
 
-                self.logger.info(f"{store_name}: {len(offers)} results in {store_elapsed:.2f}s")
+                self.logger.info("%s: %s results in %.2fs", store_name, len(offers), store_elapsed)
 
             except Exception as e:
                 # Log error but continue with other stores
                 store_errors[store_name] = str(e)
                 store_results[store_name] = 0
                 self.logger.error(
-                    f"ScraperManager: {store_name} failed with error: {e}", exc_info=True
+                    "ScraperManager: %s failed with error: %s", store_name, e, exc_info=True
                 )
 
         elapsed = time.time() - start_time
 
         # Log summary
         self.logger.info(
-            f"ScraperManager: Search completed - query='{query}', "
-            f"total_results={len(all_offers)}, "
-            f"stores={store_results}, "
-            f"errors={len(store_errors)}, "
-            f"time={elapsed:.2f}s"
+            "ScraperManager: Search completed - query='%s', total_results=%s, stores=%s, "
+            "errors=%s, time=%.2fs",
+            query,
+            len(all_offers),
+            store_results,
+            len(store_errors),
+            elapsed,
         )
 
         return all_offers
 
+    async def aget_offers(self, query: str) -> List[Offer]:
+        """
+        Awaitable variant of get_offers for async callers.
+
+        The store scrapers are blocking (HTTP clients / their own Playwright loops), so the
+        search runs in a worker thread and the caller's event loop stays free.
+
+        Args:
+            query: Search query string
+
+        Returns:
+            Combined list of Offer objects from all stores
+        """
+        return await asyncio.to_thread(self.get_offers, query)
+
+    def get_offers_many(self, queries: List[str]) -> Dict[str, List[Offer]]:
+        """
+        Get offers from all stores for several queries at once.
+
+        Each store receives the whole batch through its search_many, so stores that can
+        batch queries (Carrefour) load them together instead of one search per query.
+        A failing store contributes no offers, as in get_offers.
+
+        Args:
+            queries: Search query strings
+
+        Returns:
+            Combined offers from all stores keyed by query, in first-seen order
+        """
+        per_store = [
+            self._search_store_many(store_name, scraper, queries)
+            for store_name, scraper in self.scrapers.items()
+        ]
+        return self._combine_by_query(queries, per_store)
+
+    async def aget_offers_many(self, queries: List[str]) -> Dict[str, List[Offer]]:
+        """
+        Awaitable variant of get_offers_many; each store searches in its own worker thread.
+
+        Args:
+            queries: Search query strings
+
+        Returns:
+            Combined offers from all stores keyed by query, in first-seen order
+        """
+        per_store = await asyncio.gather(
+            *(
+                asyncio.to_thread(self._search_store_many, store_name, scraper, queries)
+                for store_name, scraper in self.scrapers.items()
+            )
+        )
+        return self._combine_by_query(queries, per_store)
+
+    def _search_store_many(
+        self, store_name: str, scraper: BaseScraper, queries: List[str]
+    ) -> Dict[str, List[Offer]]:
+        """One store's offers for a batch of queries; {} if the store fails."""
+        try:
+            store_start = time.time()
+            results = scraper.search_many(queries)
+            self.logger.info(
+                "%s: %s queries, %s results in %.2fs",
+                store_name,
+                len(results),
+                sum(len(offers) for offers in results.values()),
+                time.time() - store_start,
+            )
+            return results
+        except Exception as e:
+            self.logger.error(
+                "ScraperManager: %s failed with error: %s", store_name, e, exc_info=True
+            )
+            return {}
+
+    @staticmethod
+    def _combine_by_query(
+        queries: List[str], per_store: List[Dict[str, List[Offer]]]
+    ) -> Dict[str, List[Offer]]:
+        """Merge per-store results into one list per query, stores in registration order."""
+        combined: Dict[str, List[Offer]] = {query: [] for query in queries}
+        for results in per_store:
+            for query, offers in results.items():
+                if query in combined:
+                    combined[query].extend(offers)
+        return combined
+
     def get_offers_parallel(self, query: str, max_workers: int = 3) -> List[Offer]:
         """
         Get offers from all stores in parallel (experimental).
@@ -154,8 +243,9 @@ class ScraperManager:
         """
         start_time = time.time()
         self.logger.info(
-            f"ScraperManager: Starting parallel search for '{query}' "
-            f"across {len(self.scrapers)} stores"
+            "ScraperManager: Starting parallel search for '%s' across %s stores",
+            query,
+            len(self.scrapers),
         )
 
         all_offers: List[Offer] = []
@@ -179,7 +269,7 @@ class ScraperManager:
             for future in as_completed(futures):
                 store_name, offers, error = future.result()
                 if error:
-                    self.logger.error(f"ScraperManager: {store_name} failed: {error}")
+                    self.logger.error("ScraperManager: %s failed: %s", store_name, error)
                     store_results[store_name] = 0
                 else:
                     all_offers.extend(offers)
@@ -187,8 +277,9 @@ class ScraperManager:
 
         elapsed = time.time() - start_time
         self.logger.info(
-            f"ScraperManager: Parallel search completed - "
-            f"total_results={len(all_offers)}, time={elapsed:.2f}s"
+            "ScraperManager: Parallel search completed - total_results=%s, time=%.2fs",
+            len(all_offers),
+            elapsed,
         )
 
         return all_offers
@@ -211,7 +302,7 @@ class ScraperManager:
 
         if not scraper:
             self.logger.warning(
-                f"Store '{store}' not found. Available: {list(self.scrapers.keys())}"
+                "Store '%s' not found. Available: %s", store, list(self.scrapers.keys())
             )
             return []
 
@@ -20,7 +20,14 @@ import logging
 from dataclasses import dataclass
 from typing import List, Optional, Tuple
 
-from .base import BaseScraper, Offer, ScraperFactory, normalize_text, extract_brand
+from .base import (
+    DEFAULT_MAX_RESULTS,
+    BaseScraper,
+    Offer,
+    ScraperFactory,
+    normalize_text,
+    extract_brand,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -252,8 +259,9 @@ async def search_mercadona_cheapest(
                         all_matches.append(product)
 
         logger.info(
-            f"Scanned ~{total_products_scanned} products "
-            f"across {len(categories)} top-level groups."
+            "Scanned ~%s products across %s top-level groups.",
+            total_products_scanned,
+            len(categories),
         )
 
         if not all_matches:
@@ -279,9 +287,10 @@ class MercadonaScraper(BaseScraper):
     """
 
     STORE_NAME = "Mercadona"
+    NORMALIZES_OWN_NAMES = True
     BASE_URL = "https://tienda.mercadona.es"
 
-    def _fetch_products(self, query: str) -> List[Offer]:
+    def _fetch_products(self, query: str, max_results: int = DEFAULT_MAX_RESULTS) -> List[Offer]:
         """
         Fetch products from Mercadona API.
         Runs async code in sync context for BaseScraper interface.
@@ -295,14 +304,15 @@ class MercadonaScraper(BaseScraper):
 
         # Convert MercadonaProduct to Offer (Adapter pattern)
         offers: List[Offer] = []
-        for product in matches[:20]:  # Limit to top 20 results
+        for product in matches[:max_results]:
+            name_normalized = normalize_text(product.name)
             offer = Offer(
                 store=self.STORE_NAME,
                 name=product.name,
-                brand=extract_brand(product.name),
+                brand=extract_brand(product.name, name_normalized),
                 price=product.price,
                 url=f"{self.BASE_URL}/product/{product.slug}" if product.slug else None,
-                normalized_name=normalize_text(product.name),
+                normalized_name=name_normalized,
             )
             offers.append(offer)
 
@@ -327,5 +337,4 @@ def scrape_mercadona(query: str) -> List[Offer]:
     Returns:
         List of Offer objects
     """
-    scraper = MercadonaScraper()
-    return scraper.search(query)
+    return ScraperFactory.create("mercadona").search(query)
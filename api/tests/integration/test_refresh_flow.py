@@ -57,3 +57,223 @@ def test_refresh_updates_items(monkeypatch):
     assert item.comparison_json is not None
     # selected should be present in comparison_json
     assert item.comparison_json.get("selected") is not None
+
+
+def test_large_offer_batches_scored_in_process_pool(monkeypatch):
+    import app.services.refresh_service as rs
+    from app.services.normalization import build_product_spec
+    from app.services.scorer import filter_and_pick_best
+
+    spec = build_product_spec("Leche 1L", category="milk", variants=["desnatada"])
+    offers = fake_get_offers(None, "leche") * 3
+
+    monkeypatch.setattr(rs, "SCORING_OFFLOAD_THRESHOLD", 1)
+    try:
+        best, ranked = asyncio.run(rs._pick_best(spec, offers, top_k=10))
+    finally:
+        rs.shutdown_scoring_pool()
+
+    assert (best, ranked) == filter_and_pick_best(spec, offers, top_k=10)
+
+
+def test_broken_scoring_pool_is_replaced(monkeypatch):
+    from concurrent.futures.process import BrokenProcessPool
+    import app.services.refresh_service as rs
+    from app.services.normalization import build_product_spec
+    from app.services.scorer import filter_and_pick_best
+
+    class BrokenPool:
+        shut_down = False
+
+        def submit(self, *args, **kwargs):
+            raise BrokenProcessPool("worker died")
+
+        def shutdown(self, wait=True, cancel_futures=False):
+            self.shut_down = True
+
+    broken = BrokenPool()
+    spec = build_product_spec("Leche 1L", category="milk")
+    offers = fake_get_offers(None, "leche")
+    monkeypatch.setattr(rs, "SCORING_OFFLOAD_THRESHOLD", 1)
+    monkeypatch.setattr(rs, "_scoring_pool", broken)
+
+    result = asyncio.run(rs._pick_best(spec, offers, top_k=10))
+
+    assert result == filter_and_pick_best(spec, offers, top_k=10)
+    assert broken.shut_down
+    assert rs._scoring_pool is None
+
+
+def test_refresh_scrapes_items_concurrently_within_limit(monkeypatch):
+    import threading
+    import time
+    import app.services.refresh_service as rs
+    import app.services.scrapers.manager as sm
+
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+
+    sl = ShoppingList(name="Concurrent List")
+    session.add(sl)
+    session.commit()
+    for name in ["Leche 1L", "Leche entera", "Leche desnatada", "Leche semi"]:
+        session.add(ShoppingListItem(shopping_list_id=sl.id, name=name, category="milk"))
+    session.commit()
+
+    lock = threading.Lock()
+    state = {"active": 0, "peak": 0}
+
+    def slow_get_offers(self, query):
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        time.sleep(0.05)
+        with lock:
+            state["active"] -= 1
+        return fake_get_offers(self, query)
+
+    monkeypatch.setattr(sm.ScraperManager, "get_offers", slow_get_offers)
+    monkeypatch.setattr(rs, "REFRESH_CONCURRENCY", 2)
+
+    summary = refresh_shopping_list(sl.id, session)
+
+    assert summary["updated_items"] == 4
+    assert summary["errors"] == []
+    assert state["peak"] == 2
+
+
+def test_refresh_fetches_each_distinct_query_once(monkeypatch):
+    import app.services.scrapers.manager as sm
+
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+
+    sl = ShoppingList(name="Duplicates")
+    session.add(sl)
+    session.commit()
+    for name in ["Leche 1L", "Leche 1L", "Leche entera"]:
+        session.add(ShoppingListItem(shopping_list_id=sl.id, name=name, category="milk"))
+    session.commit()
+
+    queries = []
+
+    def counting_get_offers(self, query):
+        queries.append(query)
+        return fake_get_offers(self, query)
+
+    monkeypatch.setattr(sm.ScraperManager, "get_offers", counting_get_offers)
+
+    summary = refresh_shopping_list(sl.id, session)
+
+    assert summary["updated_items"] == 3
+    assert sorted(queries) == ["Leche 1L", "Leche entera"]
+
+
+def test_scheduler_claims_each_due_list_once(monkeypatch):
+    from datetime import datetime, timedelta, timezone
+    import app.services.scheduler as scheduler
+
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+
+    now = datetime.now(timezone.utc)
+    session.add_all(
+        [
+            ShoppingList(name="never"),
+            ShoppingList(name="stale", last_refreshed=now - timedelta(days=1)),
+            ShoppingList(name="fresh", last_refreshed=now),
+            ShoppingList(name="never too"),
+        ]
+    )
+    session.commit()
+
+    monkeypatch.setattr(scheduler, "REFRESH_BATCH_SIZE", 2)
+    cutoff = now - timedelta(hours=1)
+    first = scheduler._claim_due_lists(session, cutoff, now)
+    second = scheduler._claim_due_lists(session, cutoff, now)
+
+    assert len(first) == 2 and len(second) == 1
+    assert set(first).isdisjoint(second)
+    assert scheduler._claim_due_lists(session, cutoff, now) == []
+
+
+def test_unchanged_items_reuse_their_spec(monkeypatch):
+    from app.services import refresh_service
+
+    refresh_service._cached_spec.cache_clear()
+    first = refresh_service._cached_spec("Leche 1L", None, "milk", ("desnatada",))
+    again = refresh_service._cached_spec("Leche 1L", None, "milk", ("desnatada",))
+    other = refresh_service._cached_spec("Leche 1L", None, "milk", ("entera",))
+
+    assert first is again
+    assert other is not first and other.variants == ["entera"]
+
+
+def test_refresh_writes_good_items_and_reports_failed_ones(monkeypatch):
+    import app.services.scrapers.manager as sm
+    from app.services import refresh_service
+
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+
+    sl = ShoppingList(name="Mixed")
+    session.add(sl)
+    session.commit()
+    good = ShoppingListItem(shopping_list_id=sl.id, name="Leche 1L", category="milk")
+    bad = ShoppingListItem(shopping_list_id=sl.id, name="boom")
+    session.add_all([good, bad])
+    session.commit()
+
+    real_cached_spec = refresh_service._cached_spec
+
+    def spec_or_fail(name, *args):
+        if name == "boom":
+            raise RuntimeError("bad item")
+        return real_cached_spec(name, *args)
+
+    monkeypatch.setattr(refresh_service, "_cached_spec", spec_or_fail)
+    monkeypatch.setattr(sm.ScraperManager, "get_offers", fake_get_offers)
+
+    summary = refresh_shopping_list(sl.id, session)
+
+    assert summary["updated_items"] == 1
+    assert summary["errors"] == [{"item_id": bad.id, "error": "bad item"}]
+    session.refresh(good)
+    session.refresh(sl)
+    assert good.best_price == 1.0
+    assert sl.last_refreshed is not None
+
+
+def test_refresh_without_offers_skips_scoring(monkeypatch):
+    import app.services.scrapers.manager as sm
+    from app.services import refresh_service
+
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+
+    sl = ShoppingList(name="Empty")
+    session.add(sl)
+    session.commit()
+    item = ShoppingListItem(shopping_list_id=sl.id, name="Leche 1L", category="milk")
+    session.add(item)
+    session.commit()
+
+    def no_scoring(*args, **kwargs):
+        raise AssertionError("scoring should be skipped")
+
+    monkeypatch.setattr(sm.ScraperManager, "get_offers", lambda self, query: [])
+    monkeypatch.setattr(refresh_service, "_pick_best", no_scoring)
+
+    summary = refresh_shopping_list(sl.id, session)
+
+    session.refresh(item)
+    assert summary["updated_items"] == 1
+    assert item.best_price is None
+    assert item.comparison_json["offers_count"] == 0
+    assert item.comparison_json["ranked"] == []
+    assert item.comparison_json["selected"] is None
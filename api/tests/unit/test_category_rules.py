@@ -5,6 +5,7 @@ Unit tests for category rules and ProductSpec builder
 from app.services.normalization import (
     CATEGORY_RULES,
     build_product_spec,
+    get_forbidden_terms,
     normalize_string,
 )
 
@@ -34,3 +35,101 @@ def test_build_product_spec_forbidden_term_detected():
     # when powder appears, matched_forbidden should include it
     if matches:
         assert "powder" in matches.get("matched_forbidden", [])
+
+
+def test_get_forbidden_terms_normalized_and_cached():
+    terms = get_forbidden_terms("milk")
+    assert "powder" in terms
+    # hyphenated YAML terms are normalized the same way offer text is
+    assert "plant based" in terms
+    assert get_forbidden_terms("milk") is terms
+    assert get_forbidden_terms("no-such-category") == ()
+
+
+def test_matched_rules_follow_rule_file_order():
+    # "leche de arroz" hits both milk and rice base terms; milk is listed first in the YAML
+    spec = build_product_spec("leche de arroz")
+    assert list(spec.matched_rules) == ["milk", "rice"]
+    assert build_product_spec("nothing relevant").matched_rules == {}
+
+
+def test_rules_reload_when_file_changes(tmp_path, monkeypatch):
+    import os
+    from app.services import normalization
+
+    rules_file = tmp_path / "category_rules.yml"
+    rules_file.write_text("tea:\n  base_terms: [te]\n", encoding="utf-8")
+    os.utime(rules_file, ns=(1_000_000_000, 1_000_000_000))
+    monkeypatch.setattr(normalization, "_RULES_PATH", rules_file)
+    monkeypatch.setattr(normalization, "RULES_RECHECK_SECONDS", 0)
+
+    assert list(build_product_spec("te verde").matched_rules) == ["tea"]
+
+    rules_file.write_text("coffee:\n  base_terms: [cafe]\n", encoding="utf-8")
+    os.utime(rules_file, ns=(2_000_000_000, 2_000_000_000))
+    assert build_product_spec("te verde").matched_rules == {}
+    assert list(normalization.get_category_rules()) == ["coffee"]
+
+    # Leave the real rules loaded for the remaining tests
+    monkeypatch.undo()
+    normalization._rules_state = None
+    assert "milk" in normalization.get_category_rules()
+
+
+def test_rules_mtime_is_rechecked_at_most_every_interval(monkeypatch):
+    from app.services import normalization
+
+    normalization.get_category_rules()
+    calls = []
+    monkeypatch.setattr(normalization, "_rules_mtime", lambda: calls.append(1))
+    monkeypatch.setattr(normalization, "RULES_RECHECK_SECONDS", 3600)
+
+    for _ in range(100):
+        build_product_spec("leche entera")
+    assert calls == []
+
+
+def test_spec_carries_token_and_variant_sets():
+    spec = build_product_spec("Leche desnatada 1L", variants=["Desnatada", ""])
+    assert spec.tokens_set == frozenset(spec.tokens)
+    assert spec.variants_set == frozenset({"desnatada"})
+
+
+def test_spec_forbidden_set_covers_matched_categories():
+    spec = build_product_spec("leche de arroz")
+    expected = set(get_forbidden_terms("milk")) | set(get_forbidden_terms("rice"))
+    assert spec.forbidden_set == expected
+    assert build_product_spec("nothing relevant").forbidden_set == frozenset()
+
+
+def test_cached_item_spec_picks_up_edited_rules(tmp_path, monkeypatch):
+    import os
+    from app.services import normalization
+    from app.services.refresh_service import _cached_spec
+
+    rules_file = tmp_path / "category_rules.yml"
+    rules_file.write_text("milk:\n  base_terms: [leche]\n  forbidden_terms: [polvo]\n", "utf-8")
+    os.utime(rules_file, ns=(1_000_000_000, 1_000_000_000))
+    monkeypatch.setattr(normalization, "_RULES_PATH", rules_file)
+    monkeypatch.setattr(normalization, "RULES_RECHECK_SECONDS", 0)
+
+    assert _cached_spec("leche entera", None, None, None).forbidden_set == {"polvo"}
+
+    rules_file.write_text("milk:\n  base_terms: [leche]\n  forbidden_terms: [zzznew]\n", "utf-8")
+    os.utime(rules_file, ns=(2_000_000_000, 2_000_000_000))
+    normalization.get_category_rules()
+    assert _cached_spec("leche entera", None, None, None).forbidden_set == {"zzznew"}
+
+    monkeypatch.undo()
+    normalization._rules_state = None
+    assert "milk" in normalization.get_category_rules()
+
+
+def test_clear_normalization_caches_clears_cached_item_specs():
+    from app.services.normalization import clear_normalization_caches
+    from app.services.refresh_service import _cached_spec
+
+    spec = _cached_spec("leche entera", None, None, None)
+    assert _cached_spec("leche entera", None, None, None) is spec
+    clear_normalization_caches()
+    assert _cached_spec("leche entera", None, None, None) is not spec
@@ -53,3 +53,55 @@ def test_calculate_average_price():
 
     average = service.calculate_average_price(comparisons)
     assert average == 3.0
+
+
+def test_find_best_matches_ranks_by_similarity():
+    """Test that matches are filtered by threshold and ranked best-first"""
+    service = CompareService()
+    products = [
+        {"id": 1, "name": "Whole Milk 1L"},
+        {"id": 2, "name": "Milk"},
+        {"id": 3, "name": "Bread"},
+    ]
+
+    matches = service.find_best_matches("milk", products, threshold=0.3)
+    assert [m["id"] for m in matches] == [2, 1]
+    assert matches[0]["similarity"] == 1.0
+
+
+def test_compare_items_across_stores_keeps_request_order():
+    """Test that sparse price lookups still report items in request order"""
+    service = CompareService()
+    item_prices = {
+        ("bread", "Store B"): 1.5,
+        ("milk", "Store B"): 2.5,
+        ("milk", "Store A"): 2.0,
+        ("eggs", "Store C"): 3.0,
+    }
+
+    result = service.compare_items_across_stores(
+        ["milk", "bread", "cheese"], ["Store A", "Store B"], item_prices
+    )
+    assert [(i.name, i.store) for i in result.items] == [
+        ("milk", "Store A"),
+        ("milk", "Store B"),
+        ("bread", "Store B"),
+    ]
+    assert result.unmatched == ["cheese"]
+    assert {t.store: t.total for t in result.storeTotals} == {"Store A": 2.0, "Store B": 4.0}
+    assert result.overallTotal == 2.0
+
+
+def test_get_price_statistics():
+    """Test min/max/average/median over unsorted prices"""
+    service = CompareService()
+    comparisons = [
+        ProductComparison(
+            product_id=1, product_name="Milk", store_id=i, store_name=f"Store {i}", price=p
+        )
+        for i, p in enumerate([4.0, 1.0, 3.0, 2.0], start=1)
+    ]
+
+    stats = service.get_price_statistics(comparisons)
+    assert stats == {"count": 4, "min": 1.0, "max": 4.0, "average": 2.5, "median": 2.5}
+    assert service.get_price_statistics(comparisons[:3])["median"] == 3.0
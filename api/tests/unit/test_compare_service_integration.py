@@ -4,7 +4,7 @@ Tests the full integration with database
 """
 
 import pytest
-from app.services.compare_service import CompareService
+from app.services.compare_service import CompareService, invalidate_catalog_cache
 from app.schemas import CompareRequest
 
 
@@ -233,3 +233,25 @@ class TestCompareBasket:
         # Should match all products
         assert len(response.items) == 3
         assert len(response.unmatched) == 0
+
+    def test_catalog_index_reused_until_invalidated(self, test_db, seed_test_data):
+        """
+        Test Case: Cached name indexes follow renames once invalidated
+
+        Scenario: Compare, rename "Milk" in place (row count and max id unchanged), compare again
+        Expected: The stale index still resolves "Milk" until invalidate_catalog_cache() runs
+        """
+        service = CompareService()
+        request = CompareRequest(items=["Milk", "Oat Milk"], stores=["Target"])
+
+        response = service.compare_basket(request, test_db)
+        assert response.unmatched == ["Oat Milk"]
+
+        seed_test_data["products"][0].name = "Oat Milk"
+        test_db.commit()
+        assert service.compare_basket(request, test_db).unmatched == ["Oat Milk"]
+
+        invalidate_catalog_cache()
+        response = service.compare_basket(request, test_db)
+        assert response.unmatched == ["Milk"]
+        assert [item.name for item in response.items] == ["Oat Milk"]
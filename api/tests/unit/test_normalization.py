@@ -7,6 +7,7 @@ from app.services.normalization import (
     normalize_product_name,
     tokenize_product_name,
     calculate_similarity,
+    remove_accents,
     SYNONYMS_MAP,
 )
 
@@ -92,10 +93,18 @@ def test_normalize_product_name():
     assert normalize_product_name("") == ""
 
 
+def test_normalize_product_name_expands_unit_abbreviations():
+    """Whole-word unit abbreviations are expanded, including adjacent repeats"""
+    assert normalize_product_name("Rice 1 KG pk") == "rice 1 kilogram pack"
+    assert normalize_product_name("5 g g sugar") == "5 gram gram sugar"
+    assert normalize_product_name("glass lid") == "glass lid"
+
+
 def test_tokenize_product_name():
     """Test product name tokenization"""
     tokens = tokenize_product_name("Fresh Milk 2L")
-    assert tokens == ["fresh", "milk", "2l"]
+    assert tokens == ("fresh", "milk", "2l")
+    assert tokenize_product_name("") == ()
 
 
 def test_calculate_similarity():
@@ -119,3 +128,19 @@ def test_synonyms_map_coverage():
     assert "courgette" in SYNONYMS_MAP
     assert "zucchini" in SYNONYMS_MAP
     assert len(SYNONYMS_MAP) > 0
+
+
+def test_normalize_item_name_is_memoized():
+    """Repeated names are served from the normalization cache"""
+    normalize_item_name.cache_clear()
+    assert normalize_item_name("Fresh  Milk") == "fresh milk"
+    assert normalize_item_name("Fresh  Milk") == "fresh milk"
+    assert normalize_item_name.cache_info().hits == 1
+
+
+def test_remove_accents_spanish_and_fallback():
+    """Spanish letters fold directly; other marks and compatibility forms still go through NFKD"""
+    assert remove_accents("Jamón Ibérico Añejo Pingüino") == "Jamon Iberico Anejo Pinguino"
+    assert remove_accents("crème brûlée") == "creme brulee"
+    assert remove_accents("Łódź ǅ ﬁno") == "Łodz Dz fino"
+    assert remove_accents("") == ""
@@ -3,7 +3,7 @@ Unit tests for scorer behavior: brand preference, variant boosts, forbidden reje
 """
 
 from app.services.normalization import build_product_spec
-from app.services.scorer import filter_and_pick_best, score_offer, hard_filters_fail
+from app.services.scorer import filter_and_pick_best, score_offer, hard_filters_fail, _prepare_spec
 
 
 def make_offer(name, price=None, category=None, description=None, store="S"):
@@ -17,6 +17,13 @@ def test_forbidden_term_rejects_offer():
     assert hard_filters_fail(spec, off) is True
 
 
+def test_offer_without_base_term_rejected():
+    spec = build_product_spec("Leche entera 1L")
+    off = make_offer("Pan de molde blanco", price=1.0, category="bread")
+    assert hard_filters_fail(spec, off) is True
+    assert hard_filters_fail(spec, make_offer("Leche Entera Pascual 1L", price=1.2)) is False
+
+
 def test_brand_match_boosts_score():
     spec = build_product_spec("Coca Cola 1.5L", brand="coca cola")
     # two offers: one cheaper but different brand, one slightly more expensive but correct brand
@@ -36,3 +43,38 @@ def test_variant_boosting():
     best, ranked = filter_and_pick_best(spec, [off_whole, off_full], top_k=2)
     assert best is not None
     assert "desnatada" in best.get("name").lower()
+
+
+def test_prepared_spec_scores_match_unprepared():
+    spec = build_product_spec("Leche desnatada 1L", brand="pascual", variants=["desnatada"])
+    off = make_offer("Leche Pascual desnatada 1L", price=1.3, category="milk")
+    prepared = _prepare_spec(spec)
+    assert score_offer(spec, off, 0.5, prepared=prepared) == score_offer(spec, off, 0.5)
+
+
+def test_top_k_is_prefix_of_full_ranking():
+    spec = build_product_spec("Leche 1L")
+    offers = [
+        make_offer(f"Leche marca{i} 1L", price=1.0 + (i * 7 % 10) / 10, category="milk")
+        for i in range(12)
+    ]
+    best_all, ranked_all = filter_and_pick_best(spec, offers, top_k=len(offers))
+    best, ranked = filter_and_pick_best(spec, offers, top_k=3)
+    assert best == best_all
+    assert ranked == ranked_all[:3]
+
+
+def test_offer_text_keeps_falsy_non_string_fields():
+    from app.services.scorer import _offer_text
+
+    assert _offer_text({"name": "Huevos", "category": None, "description": 0}) == "huevos 0"
+    assert _offer_text({"name": "Huevos"}) == "huevos"
+
+
+def test_minimal_terms_drop_duplicates_and_superstrings():
+    from app.services.scorer import _minimal_terms
+
+    assert _minimal_terms(["leche entera", "leche", "cafe", "leche", "descafeinado"]) == (
+        "cafe",
+        "leche",
+    )
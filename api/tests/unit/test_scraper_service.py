@@ -0,0 +1,108 @@
+"""
+Unit tests for ScraperService.process_offers database writes
+"""
+
+from app.models import Price, Product, Supermarket
+from app.services.scraper_service import ScraperService
+from app.services.scrapers import Offer
+
+
+def test_process_offers_creates_then_updates_in_batch(test_db):
+    test_db.add(Supermarket(name="Mercadona", city="Madrid"))
+    test_db.commit()
+
+    service = ScraperService(test_db)
+    offers = [
+        Offer(store="mercadona", name="Leche Entera", price=1.1),
+        Offer(store="Dia", name="Leche Entera", price=0.99),
+        Offer(store="Mercadona", name="LECHE ENTERA", price=1.05),
+    ]
+    results = service.process_offers(offers)
+
+    assert results == {"processed": 3, "created": 2, "updated": 1, "errors": []}
+    # Names match case-insensitively: one existing store reused, one new store and product
+    assert test_db.query(Supermarket).count() == 2
+    assert test_db.query(Product).count() == 1
+    by_store = {p.supermarket.name: float(p.price) for p in test_db.query(Price).all()}
+    assert by_store == {"Mercadona": 1.05, "Dia": 0.99}
+
+    results = service.process_offers([Offer(store="Dia", name="leche entera", price=0.95)])
+    assert results["updated"] == 1 and results["created"] == 0
+    assert test_db.query(Price).count() == 2
+
+
+def test_scrape_all_products_sends_each_store_one_batch(test_db):
+    import asyncio
+    import threading
+
+    # Both stores must be searching at the same time to get past the barrier
+    barrier = threading.Barrier(2, timeout=5)
+    calls = []
+
+    class FakeStore:
+        def __init__(self, store):
+            self.store = store
+
+        def search_many(self, queries):
+            calls.append((self.store, list(queries)))
+            barrier.wait()
+            return {q: [Offer(store=self.store, name=f"{q} 1kg", price=1.0)] for q in queries}
+
+    service = ScraperService(test_db)
+    service.manager.scrapers = {"dia": FakeStore("Dia"), "carrefour": FakeStore("Carrefour")}
+
+    queries = ["arroz", "pasta", "pan", "aceite"]
+    results = asyncio.run(service.scrape_all_products(queries))
+
+    assert sorted(calls) == [("Carrefour", queries), ("Dia", queries)]
+    assert [d["query"] for d in results["details"]] == queries
+    assert all(d["offers_found"] == 2 for d in results["details"])
+    assert results["total_created"] == 8
+    assert test_db.query(Product).count() == 4
+
+
+def test_name_key_follows_name(test_db):
+    product = Product(name="  Leche ENTERA ")
+    assert product.name_key == "leche entera"
+    product.name = "Pan"
+    assert product.name_key == "pan"
+
+    test_db.add(Supermarket(name="Mercadona"))
+    test_db.commit()
+    store = ScraperService(test_db).get_or_create_supermarket("MERCADONA ")
+    assert store.name == "Mercadona"
+    assert test_db.query(Supermarket).count() == 1
+
+
+def test_resolved_rows_are_reused_across_batches(test_db):
+    from sqlalchemy import event
+
+    # Like app.db.SessionLocal: committed rows stay loaded
+    test_db.expire_on_commit = False
+    service = ScraperService(test_db)
+    service.process_offers([Offer(store="Dia", name="Pan", price=0.5)])
+
+    statements = []
+    engine = test_db.get_bind()
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        service.process_offers([Offer(store="DIA", name="pan", price=0.45)])
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    # Store and product come from the service cache; only prices are read and written
+    assert not any("FROM supermarkets" in s or "FROM products" in s for s in statements)
+    assert float(test_db.query(Price).one().price) == 0.45
+
+
+def test_single_row_helpers_flush_without_committing(test_db):
+    service = ScraperService(test_db)
+    store = service.get_or_create_supermarket("Lidl")
+    product = service.get_or_create_product("Arroz")
+    price = service.update_price(product, store, 1.25)
+    assert store.id and product.id and price.id
+
+    test_db.rollback()
+    assert test_db.query(Price).count() == 0
+    assert test_db.query(Supermarket).count() == 0
@@ -85,6 +85,8 @@ class TestNormalizeText:
         assert normalize_text("café") == "cafe"
         assert normalize_text("niño") == "nino"
         assert normalize_text("Leche Desnatada") == "leche desnatada"
+        assert normalize_text("PIÑA Açaí Über") == "pina acai uber"
+        assert normalize_text("Ωméga x́") == "ωmega x"  # outside the table: NFD path
 
     def test_collapse_whitespace(self):
         assert normalize_text("hello   world") == "hello world"
@@ -98,6 +100,12 @@ class TestNormalizeText:
         result = normalize_text("  LECHE  Entera   Hacendado  ")
         assert result == "leche entera hacendado"
 
+    def test_repeat_calls_are_cached(self):
+        normalize_text.cache_clear()
+        assert normalize_text("Café con Leche") == "cafe con leche"
+        assert normalize_text("Café con Leche") == "cafe con leche"
+        assert normalize_text.cache_info().hits == 1
+
 
 class TestExtractBrand:
     """Tests for brand extraction function"""
@@ -106,6 +114,26 @@ class TestExtractBrand:
         assert extract_brand("Leche Hacendado 1L") == "Hacendado"
         assert extract_brand("Yogur Danone Natural") == "Danone"
 
+    def test_known_brand_first_whole_word_match(self):
+        assert extract_brand("Leche Central Lechera Pascual 1L") == "Central Lechera"
+        assert extract_brand("Pan de molde Carrefour") == "Carrefour"
+        # "dia" inside another word is not the Dia brand
+        assert extract_brand("Galletas Diamante 200g") == "Galletas"
+
+    def test_uses_precomputed_normalized_name(self):
+        name = "Chocolate Nestlé 100g"
+        assert extract_brand(name, normalize_text(name)) == "Nestle"
+
+    def test_normalized_name_hint_does_not_change_result(self):
+        from app.services.scrapers.lidl import _extract_lidl_brand
+
+        for name in ["Leche CENTRAL  LECHERA 1L", "Chocolate Nestlé 100g", "Queso MILBONA 200g"]:
+            assert extract_brand(name) == extract_brand(name, normalize_text(name))
+            assert _extract_lidl_brand(name) == _extract_lidl_brand(name, normalize_text(name))
+        assert extract_brand("Leche CENTRAL  LECHERA 1L") == "Central Lechera"
+        assert extract_brand("Chocolate Nestlé 100g") == "Nestle"
+        assert _extract_lidl_brand("Queso MILBONA 200g") == "Milbona"
+
     def test_unknown_brand_uses_first_word(self):
         # First word used as fallback if not a common word
         result = extract_brand("SuperMarca Producto 500g")
@@ -170,12 +198,41 @@ class TestScraperFactory:
         scraper = ScraperFactory.create("unknown_store")
         assert scraper is None
 
+    def test_search_normalizes_names_unless_scraper_does(self):
+        from app.services.scrapers.base import BaseScraper
+
+        class RawScraper(BaseScraper):
+            def _fetch_products(self, query, max_results=20):
+                return [Offer(store="Raw", name="Café  Molido", price=3.0)]
+
+        assert RawScraper().search("cafe")[0].normalized_name == "cafe molido"
+
+        RawScraper.NORMALIZES_OWN_NAMES = True
+        assert RawScraper().search("cafe")[0].normalized_name is None
+
     def test_get_available_stores(self):
         stores = ScraperFactory.get_available_stores()
         assert "mercadona" in stores
         assert "carrefour" in stores
         assert "alcampo" in stores
 
+    def test_create_reuses_instance_until_reregistered(self, monkeypatch):
+        monkeypatch.setattr(ScraperFactory, "_scrapers", dict(ScraperFactory._scrapers))
+        monkeypatch.setattr(ScraperFactory, "_instances", {})
+
+        first = ScraperFactory.create("carrefour")
+        assert ScraperFactory.create("CARREFOUR") is first
+
+        # Registering the same class again (double import) is a no-op
+        ScraperFactory.register("carrefour", type(first))
+        assert ScraperFactory.create("carrefour") is first
+
+        class OtherScraper(type(first)):
+            pass
+
+        ScraperFactory.register("carrefour", OtherScraper)
+        assert isinstance(ScraperFactory.create("carrefour"), OtherScraper)
+
 
 # ---- Individual Scraper Tests ------------------------------------------------
 
@@ -211,6 +268,145 @@ class TestCarrefourScraper:
             assert offer.normalized_name is not None
             assert offer.normalized_name == offer.normalized_name.lower()
 
+    def test_search_many_batches_live_queries_and_falls_back_per_query(self, monkeypatch):
+        from app.services.scrapers import carrefour
+
+        searched = []
+
+        async def fake_search(query, max_results=20):
+            searched.append(query)
+            if query == "leche":
+                return [{"display_name": "Leche Carrefour 1L", "price": 0.9}]
+            return []
+
+        monkeypatch.setattr(carrefour, "PLAYWRIGHT_AVAILABLE", True)
+        monkeypatch.setattr(carrefour, "_search_carrefour_playwright", fake_search)
+
+        results = carrefour.CarrefourScraper().search_many(["leche", "pan", "leche"])
+
+        assert sorted(searched) == ["leche", "pan"]
+        assert list(results) == ["leche", "pan"]
+        assert [o.name for o in results["leche"]] == ["Leche Carrefour 1L"]
+        assert results["pan"] and all("Pan" in o.name for o in results["pan"])
+
+    def test_search_many_bounds_open_pages_and_times_out_per_query(self, monkeypatch):
+        import asyncio
+        from app.services.scrapers import carrefour
+
+        running = {"now": 0, "peak": 0}
+
+        async def fake_search(query, max_results=20):
+            running["now"] += 1
+            running["peak"] = max(running["peak"], running["now"])
+            try:
+                await asyncio.sleep(1 if query == "pan" else 0.01)
+            finally:
+                running["now"] -= 1
+            return [{"display_name": f"{query.title()} Carrefour", "price": 1.0}]
+
+        monkeypatch.setattr(carrefour, "PLAYWRIGHT_AVAILABLE", True)
+        monkeypatch.setattr(carrefour, "_search_carrefour_playwright", fake_search)
+        monkeypatch.setattr(carrefour, "CARREFOUR_BATCH_CONCURRENCY", 2)
+        monkeypatch.setattr(carrefour, "CARREFOUR_QUERY_TIMEOUT_SECONDS", 0.2)
+
+        queries = ["leche", "pan", "arroz", "huevos", "yogur"]
+        results = carrefour.CarrefourScraper().search_many(queries)
+
+        assert running["peak"] == 2
+        # Only the slow query timed out and fell back; the rest kept their live results
+        for query in queries:
+            if query != "pan":
+                assert [o.name for o in results[query]] == [f"{query.title()} Carrefour"]
+        assert [o.name for o in results["pan"]] == [
+            "Pan de molde integral Carrefour 450g",
+            "Pan Bimbo familiar 700g",
+        ]
+
+    def test_discovered_api_is_called_directly_and_403_falls_back(self, monkeypatch):
+        import httpx
+        from app.services.scrapers import carrefour
+        from app.services.scrapers.browser import run_coroutine
+
+        endpoint = carrefour._endpoint_template(
+            "https://www.carrefour.es/search-api/query/v1/search?query=Leche&rows=24", "leche"
+        )
+        assert endpoint == (
+            "https://www.carrefour.es/search-api/query/v1/search",
+            {"query": "Leche", "rows": "24"},
+            "query",
+        )
+
+        status = {"code": 200}
+
+        def handler(request):
+            assert request.url.params["query"] == "huevos"
+            docs = [{"display_name": "Huevos M docena", "active_price": 2.5}]
+            return httpx.Response(status["code"], json={"content": {"docs": docs}})
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(carrefour, "_api_endpoint", endpoint)
+        monkeypatch.setattr(carrefour, "get_http_client", lambda: client)
+
+        products = run_coroutine(carrefour._search_carrefour("huevos"))
+        assert [p["display_name"] for p in products] == ["Huevos M docena"]
+
+        status["code"] = 403
+        assert run_coroutine(carrefour._fast_http_search("huevos")) is None
+        # A failing endpoint is dropped until Playwright rediscovers it
+        assert carrefour._api_endpoint is None
+
+    def test_dom_extraction_reads_each_card_once(self):
+        from app.services.scrapers import carrefour
+        from app.services.scrapers.browser import run_coroutine
+
+        class FakeItem:
+            def __init__(self, fields):
+                self.fields = fields
+                self.calls = 0
+
+            async def evaluate(self, script):
+                self.calls += 1
+                if self.fields is None:
+                    raise RuntimeError("detached")
+                return self.fields
+
+        items = [
+            FakeItem([" Leche entera ", "0,89 €"]),
+            FakeItem(["Sin precio", ""]),
+            FakeItem(None),
+            FakeItem(["Pan", "1.20"]),
+        ]
+        page = MagicMock()
+
+        async def query_selector_all(selector):
+            return items
+
+        page.query_selector_all = query_selector_all
+
+        products = run_coroutine(carrefour._extract_from_dom(page, max_results=3))
+
+        assert products == [{"name": "Leche entera", "price": 0.89}]
+        assert [item.calls for item in items] == [1, 1, 1, 0]
+
+    def test_max_results_caps_offers(self):
+        assert len(scrape_carrefour("leche")) == 4
+        scraper = ScraperFactory.create("carrefour")
+        assert [o.name for o in scraper.search("leche", max_results=2)] == [
+            "Leche entera Carrefour 1L",
+            "Leche semidesnatada Carrefour 1L",
+        ]
+
+    def test_fallback_matches_by_substring_and_caches(self):
+        from app.services.scrapers.base import match_fallback
+
+        match_fallback.cache_clear()
+        names = [o.name for o in scrape_carrefour("Aceite de oliva")]
+        scrape_carrefour("aceite  de OLIVA")
+
+        # Category "aceite" matches; the "de" in "Pan de molde" must not
+        assert names == ["Aceite oliva virgen extra Carrefour 1L"]
+        assert match_fallback.cache_info().hits == 1
+
 
 class TestAlcampoScraper:
     """Tests for Alcampo scraper (MVP with mock data)"""
@@ -251,6 +447,41 @@ class TestMercadonaScraper:
         assert scraper.STORE_NAME == "Mercadona"
 
 
+class TestSharedBrowserRuntime:
+    def test_coroutines_share_one_persistent_loop(self):
+        import asyncio
+        from app.services.scrapers import browser
+
+        async def current_loop():
+            return asyncio.get_running_loop()
+
+        first = browser.run_coroutine(current_loop())
+        assert browser.run_coroutine(current_loop()) is first
+        assert first.is_running()
+
+    def test_context_reused_per_key_until_browser_changes(self, monkeypatch):
+        from app.services.scrapers import browser
+
+        class FakeBrowser:
+            async def new_context(self, **options):
+                return MagicMock(browser=self, options=options)
+
+        current = FakeBrowser()
+
+        async def fake_get_browser():
+            return current
+
+        monkeypatch.setattr(browser, "get_browser", fake_get_browser)
+        monkeypatch.setattr(browser, "_contexts", {})
+
+        first = browser.run_coroutine(browser.get_context("carrefour", locale="es-ES"))
+        assert browser.run_coroutine(browser.get_context("carrefour")) is first
+        assert first.options == {"locale": "es-ES"}
+
+        current = FakeBrowser()  # relaunched browser
+        assert browser.run_coroutine(browser.get_context("carrefour")) is not first
+
+
 # ---- ScraperManager Tests ----------------------------------------------------
 
 
@@ -277,6 +508,26 @@ class TestScraperManager:
         stores = set(o.store for o in offers)
         assert stores == {"Carrefour"} or len(stores) == 0
 
+    def test_aget_offers_matches_get_offers(self):
+        import asyncio
+
+        manager = ScraperManager(stores=["alcampo"])
+        offers = asyncio.run(manager.aget_offers("arroz"))
+
+        assert [o.name for o in offers] == [o.name for o in manager.get_offers("arroz")]
+
+    def test_get_offers_many_matches_get_offers_per_query(self):
+        import asyncio
+
+        manager = ScraperManager(stores=["alcampo", "dia"])
+        queries = ["arroz", "leche", "arroz"]
+        batched = manager.get_offers_many(queries)
+
+        assert list(batched) == ["arroz", "leche"]
+        assert asyncio.run(manager.aget_offers_many(queries)).keys() == batched.keys()
+        for query, offers in batched.items():
+            assert [o.name for o in offers] == [o.name for o in manager.get_offers(query)]
+
     def test_get_offers_by_store(self):
         manager = ScraperManager()
         offers = manager.get_offers_by_store("arroz", "alcampo")